@@ -0,0 +1,69 @@
+"""Сравнение кеша со сжатием ответов и без него: размер базы SQLite
+и время повторного («тёплого») запуска, когда все страницы берутся из кеша.
+
+Запуск из корня проекта:
+    python benchmarks/bench_cache.py
+"""
+import tempfile
+import timeit
+from io import BytesIO
+from pathlib import Path
+
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession, pickle_serializer
+from urllib3 import HTTPResponse
+
+from paths import BENCH_DIR
+from sessions import compressed_serializer
+
+PEP_PAGE = (BENCH_DIR / 'pages' / 'pep-0008.html').read_bytes()
+URLS = [
+    f'https://peps.python.org/pep-{number:04}/' for number in range(200)
+]
+REPEAT = 5
+
+
+class PageAdapter(HTTPAdapter):
+    """Отдаёт карточку PEP на любой запрос, не обращаясь к сети."""
+
+    def send(self, request, **kwargs):
+        return self.build_response(request, HTTPResponse(
+            body=BytesIO(PEP_PAGE),
+            headers={'Content-Type': 'text/html; charset=utf-8'},
+            status=200,
+            preload_content=False,
+            request_url=request.url,
+        ))
+
+
+def load_all(session):
+    for url in URLS:
+        session.get(url).text
+
+
+def measure(serializer, cache_dir):
+    session = CachedSession(
+        str(cache_dir / serializer.name), serializer=serializer
+    )
+    session.mount('https://', PageAdapter())
+    load_all(session)
+    seconds = min(timeit.repeat(
+        lambda: load_all(session), number=1, repeat=REPEAT
+    ))
+    return session.cache.responses.size(), seconds
+
+
+def main():
+    print(f'{len(URLS)} страниц по {len(PEP_PAGE) / 1024:.0f} КиБ')
+    print(f'{"Сериализация":<14}{"Кеш, КиБ":>12}{"Тёплый запуск, мс":>20}')
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for serializer in (pickle_serializer, compressed_serializer):
+            size, seconds = measure(serializer, Path(cache_dir))
+            print(
+                f'{serializer.name:<14}{size / 1024:>12.0f}'
+                f'{seconds * 1000:>20.1f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
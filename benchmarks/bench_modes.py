@@ -0,0 +1,196 @@
+"""Время работы режимов парсера на снимке страниц, без сети.
+
+Каждый режим запускается с холодным кешем (пустой кеш и сохранённое
+состояние), затем повторно с тёплым — для каждого движка разбора
+и количества потоков. Страницы отдаёт SnapshotAdapter с задержкой
+--latency на запрос. Результаты сохраняются в JSON; с --baseline
+сравниваются с прошлым отчётом, и при замедлении больше --tolerance
+(и больше --min-delta секунд) скрипт завершается с кодом 1.
+
+Запуск из корня проекта:
+    python benchmarks/bench_modes.py --output benchmarks/report.json
+    python benchmarks/bench_modes.py --baseline benchmarks/report.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import tempfile
+import time
+from itertools import product
+from pathlib import Path
+
+# snapshot импортируется первым: через paths он добавляет `src` в sys.path.
+from snapshot import DEFAULT_PEPS, SnapshotAdapter, load_snapshot
+import main
+import utils
+from configs import configure_argument_parser
+from sessions import create_session
+
+MODES = ('pep', 'whats-new', 'latest-versions', 'download')
+ENGINES = ('bs4', 'lxml')
+WORKERS = (1, 4, 10)
+CACHE_STATES = ('cold', 'warm')
+DOWNLOAD_FORMATS = ('pdf-a4.zip', 'html.zip', 'epub')
+DEFAULT_LATENCY = 0.01
+DEFAULT_TOLERANCE = 0.2
+# Разница меньше этой, сек, не считается замедлением: быстрые случаи
+# (тёплый кеш) слишком зашумлены для сравнения в долях.
+DEFAULT_MIN_DELTA = 0.05
+
+
+def run_mode(session, cli_args, adapter):
+    requests_before = adapter.requests_count
+    start = time.perf_counter()
+    # Индикаторы прогресса tqdm не выводятся, чтобы не мешать отчёту.
+    with contextlib.redirect_stderr(io.StringIO()):
+        main.MODE_TO_FUNCTION[cli_args.mode](session, cli_args)
+    return (
+        time.perf_counter() - start,
+        adapter.requests_count - requests_before,
+    )
+
+
+def run_case(pages, mode, engine, workers, latency):
+    """Холодный и тёплый запуск режима в отдельной временной директории."""
+    cli_args = configure_argument_parser(main.MODE_TO_FUNCTION.keys())
+    cli_args = main.replace_args(cli_args.parse_args([
+        mode, '-e', engine, '-w', str(workers), '--cache-backend', 'memory',
+        '--formats', *DOWNLOAD_FORMATS,
+    ]), mode=mode)
+    utils.parse_memo.clear()
+    utils.parse_memo_changed.clear()
+    with tempfile.TemporaryDirectory() as base_dir:
+        main.BASE_DIR = Path(base_dir)
+        session = create_session(cli_args)
+        adapter = SnapshotAdapter(pages, latency, pool_maxsize=workers)
+        session.mount('https://', adapter)
+        for cache_state in CACHE_STATES:
+            seconds, requests_count = run_mode(session, cli_args, adapter)
+            yield {
+                'mode': mode,
+                'engine': engine,
+                'workers': workers,
+                'cache': cache_state,
+                'seconds': round(seconds, 4),
+                'requests': requests_count,
+            }
+
+
+def get_case_key(result):
+    return (
+        result['mode'], result['engine'], result['workers'], result['cache']
+    )
+
+
+def is_regression(seconds, baseline_seconds, tolerance, min_delta):
+    return (
+        seconds > baseline_seconds * (1 + tolerance)
+        and seconds - baseline_seconds > min_delta
+    )
+
+
+def find_regressions(results, baseline, tolerance, min_delta):
+    baseline = {get_case_key(result): result for result in baseline}
+    return [
+        (result, baseline[get_case_key(result)])
+        for result in results
+        if get_case_key(result) in baseline and is_regression(
+            result['seconds'],
+            baseline[get_case_key(result)]['seconds'],
+            tolerance,
+            min_delta,
+        )
+    ]
+
+
+def configure_argument_parser_for_bench():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modes', nargs='+', default=MODES, choices=MODES)
+    parser.add_argument(
+        '--engines', nargs='+', default=ENGINES, choices=ENGINES
+    )
+    parser.add_argument('--workers', nargs='+', type=int, default=WORKERS)
+    parser.add_argument('--peps', type=int, default=DEFAULT_PEPS)
+    parser.add_argument(
+        '--latency',
+        type=float,
+        default=DEFAULT_LATENCY,
+        help='Задержка ответа на каждый запрос, сек'
+    )
+    parser.add_argument('--output', type=Path, help='Файл отчёта JSON')
+    parser.add_argument(
+        '--baseline', type=Path, help='Прошлый отчёт для сравнения'
+    )
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help='Допустимое замедление относительно --baseline, доля'
+    )
+    parser.add_argument(
+        '--min-delta',
+        type=float,
+        default=DEFAULT_MIN_DELTA,
+        help='Минимальное замедление, сек, которое считается регрессией'
+    )
+    return parser
+
+
+def main_bench():
+    arguments = configure_argument_parser_for_bench().parse_args()
+    pages = load_snapshot(arguments.peps)
+    results = []
+    print(
+        f'{"Режим":<17}{"Движок":<8}{"Потоков":>8}{"Кеш":>7}'
+        f'{"Время, с":>11}{"Запросов":>10}'
+    )
+    for mode, engine, workers in product(
+        arguments.modes, arguments.engines, arguments.workers
+    ):
+        for result in run_case(
+            pages, mode, engine, workers, arguments.latency
+        ):
+            results.append(result)
+            print(
+                f'{mode:<17}{engine:<8}{workers:>8}{result["cache"]:>7}'
+                f'{result["seconds"]:>11.3f}{result["requests"]:>10}'
+            )
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'peps': arguments.peps,
+        'latency': arguments.latency,
+        'results': results,
+    }
+    if arguments.output:
+        arguments.output.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2),
+            encoding='utf-8'
+        )
+    if arguments.baseline:
+        regressions = find_regressions(
+            results,
+            json.loads(arguments.baseline.read_text(encoding='utf-8'))[
+                'results'
+            ],
+            arguments.tolerance,
+            arguments.min_delta,
+        )
+        for result, baseline in regressions:
+            print(
+                'Замедление: {} {} -w {} ({}): {:.3f} с вместо {:.3f} с'
+                .format(
+                    *get_case_key(result),
+                    result['seconds'],
+                    baseline['seconds'],
+                )
+            )
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main_bench()
@@ -0,0 +1,47 @@
+"""Сравнение полного и частичного (SoupStrainer) разбора карточки PEP.
+
+Запуск из корня проекта:
+    python benchmarks/bench_parsing.py
+"""
+import timeit
+import tracemalloc
+
+from paths import BENCH_DIR
+from parsers import PEP_CARD_STRAINER
+from utils import find_tag, make_soup
+
+PEP_PAGE = (BENCH_DIR / 'pages' / 'pep-0008.html').read_text(encoding='utf-8')
+REPEAT = 20
+
+
+def extract_status(parse_only=None):
+    return find_tag(
+        make_soup(PEP_PAGE, parse_only), 'dl'
+    ).find(
+        string='Status'
+    ).parent.find_next_sibling().text
+
+
+def measure(parse_only):
+    seconds = min(timeit.repeat(
+        lambda: extract_status(parse_only), number=1, repeat=REPEAT
+    ))
+    tracemalloc.start()
+    extract_status(parse_only)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    assert extract_status() == extract_status(PEP_CARD_STRAINER)
+    print(f'{"Разбор":<10}{"Время, мс":>12}{"Пик памяти, КБ":>18}')
+    for name, parse_only in (
+        ('полный', None), ('strainer', PEP_CARD_STRAINER)
+    ):
+        seconds, peak = measure(parse_only)
+        print(f'{name:<10}{seconds * 1000:>12.2f}{peak / 1024:>18.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Разбор индекса PEP: построчный поиск против одного прохода по ячейкам.
+
+Построчный вариант — прежний разбор: для каждой строки `tr` числового
+индекса отдельные поиски ссылки и ячеек. Страница индекса берётся
+из записанного снимка, если он есть, иначе из синтетического
+(см. snapshot.py). Время — лучшее из --repeat запусков, с построением
+дерева разбора.
+
+Запуск из корня проекта:
+    python benchmarks/bench_pep_index.py --peps 700
+"""
+import argparse
+import timeit
+
+from lxml import etree
+
+# snapshot импортируется первым: через paths он добавляет `src` в sys.path.
+from snapshot import load_snapshot
+import lxml_parsers
+import parsers
+from constants import MAIN_PEP_URL, PEP_INDEX_COLUMNS
+from utils import make_soup
+
+DEFAULT_PEPS = 700
+DEFAULT_REPEAT = 20
+ROWS = etree.XPath('//*[@id="numerical-index"]//tbody/tr')
+ROW_LINK = etree.XPath('(.//a)[1]/@href')
+ROW_CELLS = etree.XPath(f'td[position() <= {PEP_INDEX_COLUMNS}]')
+
+
+def parse_by_rows_bs4(html):
+    return [
+        (pep.find('a')['href'], *(
+            cell.text for cell in pep.find_all('td', limit=PEP_INDEX_COLUMNS)
+        ))
+        for pep in make_soup(html, parsers.PEP_INDEX_STRAINER).select(
+            '#numerical-index tbody tr'
+        )
+    ]
+
+
+def parse_by_rows_lxml(html):
+    return [
+        (str(ROW_LINK(row)[0]), *(
+            cell.text_content() for cell in ROW_CELLS(row)
+        ))
+        for row in ROWS(lxml_parsers.make_tree(html))
+    ]
+
+
+CASES = {
+    'bs4': (parse_by_rows_bs4, parsers.parse_pep_index_records),
+    'lxml': (parse_by_rows_lxml, lxml_parsers.parse_pep_index_records),
+}
+
+
+def measure(parse, html, repeat):
+    return min(timeit.repeat(lambda: parse(html), number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--peps',
+        type=int,
+        default=DEFAULT_PEPS,
+        help='Строк в синтетическом индексе'
+    )
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    arguments = parser.parse_args()
+    html = load_snapshot(arguments.peps)[MAIN_PEP_URL].decode('utf-8')
+    print(f'{"Движок":<8}{"Строк":>7}{"По строкам, мс":>16}'
+          f'{"Один проход, мс":>17}{"Ускорение":>11}')
+    for engine, (parse_by_rows, parse_single_pass) in CASES.items():
+        rows = parse_single_pass(html)
+        # Повторы номеров схлопываются, остальное должно совпадать.
+        assert rows == list(dict.fromkeys(parse_by_rows(html))), engine
+        by_rows = measure(parse_by_rows, html, arguments.repeat)
+        single_pass = measure(parse_single_pass, html, arguments.repeat)
+        print(
+            f'{engine:<8}{len(rows):>7}{by_rows * 1000:>16.1f}'
+            f'{single_pass * 1000:>17.1f}{by_rows / single_pass:>10.2f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
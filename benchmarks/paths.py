@@ -0,0 +1,11 @@
+"""Пути бенчмарков. При импорте добавляет `src` в sys.path, поэтому
+в скриптах он импортируется раньше модулей парсера.
+"""
+import sys
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+SRC_DIR = BENCH_DIR.parent / 'src'
+
+if str(SRC_DIR) not in sys.path:
+    sys.path.append(str(SRC_DIR))
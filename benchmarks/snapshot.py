@@ -0,0 +1,299 @@
+"""Снимок страниц документации и PEP для офлайн-бенчмарков.
+
+Если в директории `benchmarks/snapshot` есть записанные страницы, используются
+они; иначе снимок детерминированно строится из шаблона карточки PEP
+`benchmarks/pages/pep-0008.html` с разметкой, как на peps.python.org
+и docs.python.org.
+
+Запись настоящих страниц (нужна сеть), из корня проекта:
+    python benchmarks/snapshot.py --peps 300
+"""
+import argparse
+import hashlib
+import random
+import re
+import time
+from io import BytesIO
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+from paths import BENCH_DIR
+from constants import EXPECTED_STATUS, MAIN_DOC_URL, MAIN_PEP_URL
+import parsers
+
+SNAPSHOT_DIR = BENCH_DIR / 'snapshot'
+PEP_TEMPLATE = (BENCH_DIR / 'pages' / 'pep-0008.html').read_text(
+    encoding='utf-8'
+)
+SECTION_PATTERN = r'<section id="section-\d+">.*?</section>'
+TEMPLATE_HEAD, *_, TEMPLATE_TAIL = re.split(
+    SECTION_PATTERN, PEP_TEMPLATE, flags=re.S
+)
+TEMPLATE_SECTIONS = re.findall(SECTION_PATTERN, PEP_TEMPLATE, flags=re.S)
+DEFAULT_PEPS = 300
+ARCHIVE_SIZE = 1024 * 1024
+ARCHIVE_FORMATS = (
+    'pdf-a4.zip', 'pdf-letter.zip', 'html.zip', 'text.zip', 'epub',
+    'texinfo.zip',
+)
+PYTHON_VERSIONS = [f'3.{minor}' for minor in range(13, -1, -1)] + [
+    f'2.{minor}' for minor in range(7, -1, -1)
+]
+SEED = 8
+
+
+def build_pep_card(number, status, sections):
+    """Карточка PEP из шаблона: свой номер, статус и объём текста."""
+    page = (
+        TEMPLATE_HEAD + ''.join(TEMPLATE_SECTIONS[:sections]) + TEMPLATE_TAIL
+    ).replace(
+        'PEP 8 – Style Guide for Python Code', f'PEP {number} – Proposal'
+    ).replace('pep-0008', f'pep-{number:04}')
+    return re.sub(
+        r'(Status<span class="colon">:</span></dt>\s*<dd[^>]*><abbr[^>]*>)'
+        r'[^<]*',
+        lambda match: match.group(1) + status,
+        page,
+        count=1
+    )
+
+
+def build_pep_row(number, status_code):
+    return (
+        f'<tr class="row-even"><td><p><abbr title="Standards Track">'
+        f'S{status_code}</abbr></p></td>'
+        f'<td><p><a class="pep reference internal" href="pep-{number:04}/"'
+        f' title="Proposal {number}">{number}</a></p></td>'
+        f'<td><p><a class="pep reference internal" href="pep-{number:04}/"'
+        f'>Proposal {number}</a></p></td><td><p>Author {number}</p></td>'
+        '</tr>\n'
+    )
+
+
+def build_pep_index(rows):
+    table = (
+        '<table class="pep-zero-table docutils align-default">'
+        '<thead><tr class="row-odd"><th class="head"><p>Type</p></th>'
+        '<th class="head"><p>PEP</p></th><th class="head"><p>Title</p></th>'
+        '<th class="head"><p>Authors</p></th></tr></thead>'
+        '<tbody>\n' + ''.join(rows) + '</tbody></table>'
+    )
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">'
+        '<title>PEP 0 – Index of Python Enhancement Proposals (PEPs)</title>'
+        '</head><body><article><section id="pep-page-section">'
+        '<h1>PEP 0 – Index of Python Enhancement Proposals (PEPs)</h1>'
+        '<section id="index-by-category"><h2>Index by Category</h2>'
+        f'{table}</section>'
+        f'<section id="numerical-index"><h2>Numerical Index</h2>{table}'
+        '</section></section></article></body></html>'
+    )
+
+
+def build_docs_page(body):
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">'
+        '<title>Python documentation</title></head><body>'
+        '<div class="sphinxsidebar"><div class="sphinxsidebarwrapper">'
+        '<div class="menu-wrapper"><nav class="menu">'
+        '<h3>Docs by version</h3><ul>'
+        + ''.join(
+            f'<li><a href="https://docs.python.org/{version}/">'
+            f'Python {version} ({"stable" if index else "in development"})'
+            '</a></li>'
+            for index, version in enumerate(PYTHON_VERSIONS[:10])
+        )
+        + '<li><a href="https://www.python.org/doc/versions/">'
+        'All versions</a></li></ul></nav></div></div></div>'
+        f'<div class="body" role="main">{body}</div></body></html>'
+    )
+
+
+def build_whats_new_index():
+    return build_docs_page(
+        '<section id="what-s-new-in-python"><h1>What’s New in Python</h1>'
+        '<div class="toctree-wrapper compound"><ul>'
+        + ''.join(
+            f'<li class="toctree-l1"><a class="reference internal" '
+            f'href="{version}.html">What’s New In Python {version}</a></li>'
+            for version in PYTHON_VERSIONS
+        )
+        + '</ul></div></section>'
+    )
+
+
+def build_version_page(version, sections):
+    return build_docs_page(
+        f'<section><h1>What’s New In Python {version}</h1>'
+        '<dl class="field-list simple">'
+        '<dt class="field-odd">Editor<span class="colon">:</span></dt>\n'
+        f'<dd class="field-odd"><p>Editor {version}</p></dd></dl>'
+        f'{"".join(TEMPLATE_SECTIONS[:sections])}</section>'
+    )
+
+
+def build_download_page():
+    return build_docs_page(
+        '<section><h1>Download Python documentation</h1>'
+        '<table class="docutils align-default"><tbody>'
+        + ''.join(
+            f'<tr><td>{archive_format}</td><td><a class="reference external"'
+            f' href="archives/python-3.13.0-docs-{archive_format}">'
+            'Download</a></td></tr>'
+            for archive_format in ARCHIVE_FORMATS
+        )
+        + '</tbody></table></section>'
+    )
+
+
+def build_snapshot(peps=DEFAULT_PEPS):
+    """Синтетический снимок: URL -> тело ответа."""
+    random_generator = random.Random(SEED)
+    pages = {}
+    rows = []
+    for number in range(peps):
+        status_code = random_generator.choice(list(EXPECTED_STATUS))
+        rows.append(build_pep_row(number, status_code))
+        pages[urljoin(MAIN_PEP_URL, f'pep-{number:04}/')] = build_pep_card(
+            number,
+            EXPECTED_STATUS[status_code][0],
+            random_generator.randint(1, 12),
+        )
+    pages[MAIN_PEP_URL] = build_pep_index(rows)
+    pages[MAIN_DOC_URL] = build_docs_page('<h1>Python documentation</h1>')
+    pages[urljoin(MAIN_DOC_URL, 'whatsnew/')] = build_whats_new_index()
+    for version in PYTHON_VERSIONS:
+        pages[urljoin(MAIN_DOC_URL, f'whatsnew/{version}.html')] = (
+            build_version_page(version, random_generator.randint(10, 40))
+        )
+    pages[urljoin(MAIN_DOC_URL, 'download.html')] = build_download_page()
+    pages = {url: page.encode('utf-8') for url, page in pages.items()}
+    for archive_format in ARCHIVE_FORMATS:
+        pages[urljoin(
+            MAIN_DOC_URL, f'archives/python-3.13.0-docs-{archive_format}'
+        )] = random_generator.randbytes(ARCHIVE_SIZE)
+    return pages
+
+
+def get_snapshot_path(url, snapshot_dir=SNAPSHOT_DIR):
+    parts = urlsplit(url)
+    path = parts.path + ('index.html' if parts.path.endswith('/') else '')
+    return snapshot_dir / parts.netloc / path.lstrip('/')
+
+
+def load_recorded_snapshot(snapshot_dir=SNAPSHOT_DIR):
+    return {
+        'https://' + path.relative_to(snapshot_dir).as_posix().removesuffix(
+            'index.html'
+        ): path.read_bytes()
+        for path in snapshot_dir.rglob('*') if path.is_file()
+    }
+
+
+def load_snapshot(peps=DEFAULT_PEPS, snapshot_dir=SNAPSHOT_DIR):
+    """Записанный снимок, если он есть, иначе синтетический.
+
+    Архивы документации не записываются: в записанный снимок
+    добавляются синтетические.
+    """
+    if not snapshot_dir.exists():
+        return build_snapshot(peps)
+    pages = load_recorded_snapshot(snapshot_dir)
+    for url, page in build_snapshot(peps=0).items():
+        if '/archives/' in url:
+            pages.setdefault(url, page)
+    return pages
+
+
+def record_snapshot(session, peps=DEFAULT_PEPS, snapshot_dir=SNAPSHOT_DIR):
+    """Записывает индексы, первые peps карточек PEP, страницы whats-new
+    и страницу загрузок в snapshot_dir.
+    """
+    def fetch(url):
+        response = session.get(url)
+        response.raise_for_status()
+        path = get_snapshot_path(url, snapshot_dir)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(response.content)
+        return response.text
+
+    pep_index = fetch(MAIN_PEP_URL)
+    for href, _ in parsers.parse_pep_index(pep_index)[:peps]:
+        fetch(urljoin(MAIN_PEP_URL, href))
+    fetch(MAIN_DOC_URL)
+    whats_new_url = urljoin(MAIN_DOC_URL, 'whatsnew/')
+    for href in parsers.parse_whats_new_index(fetch(whats_new_url)):
+        fetch(urljoin(whats_new_url, href))
+    fetch(urljoin(MAIN_DOC_URL, 'download.html'))
+
+
+class SnapshotAdapter(HTTPAdapter):
+    """Отдаёт страницы снимка вместо сети, с задержкой latency, сек.
+
+    Поддерживает HEAD, ETag / If-None-Match и Range, как сервер
+    docs.python.org; для отсутствующих страниц отвечает 404.
+    """
+
+    def __init__(self, pages, latency=0.0, **kwargs):
+        self.pages = pages
+        self.latency = latency
+        self.requests_count = 0
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        self.requests_count += 1
+        time.sleep(self.latency)
+        body = self.pages.get(request.url.split('#')[0])
+        if body is None:
+            return self.build_raw_response(request, 404)
+        etag = '"{}"'.format(hashlib.sha1(body).hexdigest())
+        headers = {
+            'ETag': etag,
+            'Content-Type': 'text/html; charset=utf-8',
+            'Content-Length': str(len(body)),
+        }
+        if request.headers.get('If-None-Match') == etag:
+            return self.build_raw_response(request, 304, headers)
+        status = 200
+        byte_range = request.headers.get('Range')
+        if byte_range and request.headers.get('If-Range') in (None, etag):
+            offset = int(byte_range[len('bytes='):].split('-')[0])
+            body = body[offset:]
+            status = 206
+            headers['Content-Length'] = str(len(body))
+        if request.method == 'HEAD':
+            body = b''
+        return self.build_raw_response(request, status, headers, body)
+
+    def build_raw_response(self, request, status, headers=None, body=b''):
+        return self.build_response(request, HTTPResponse(
+            body=BytesIO(body),
+            headers=headers or {'Content-Length': '0'},
+            status=status,
+            preload_content=False,
+            request_method=request.method,
+            request_url=request.url,
+        ))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Запись снимка страниц для бенчмарков'
+    )
+    parser.add_argument(
+        '--peps',
+        type=int,
+        default=DEFAULT_PEPS,
+        help='Сколько карточек PEP записать'
+    )
+    arguments = parser.parse_args()
+    with requests.Session() as session:
+        record_snapshot(session, arguments.peps)
+    print(f'Снимок записан в {SNAPSHOT_DIR}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+"""Асинхронная загрузка страниц через aiohttp.
+
+Страницы читаются из того же кеша requests-cache, что и у синхронной
+сессии, и сохраняются в него, поэтому повторный запуск работает без сети
+в любом режиме. Интерфейс load_pages совпадает с utils.load_pages.
+"""
+import asyncio
+import logging
+import time
+from concurrent.futures import Future
+from functools import partial
+from io import BytesIO
+
+import aiohttp
+from requests import Request
+from requests.adapters import HTTPAdapter
+from requests_cache import get_expiration_datetime, get_url_expiration
+from urllib3 import HTTPResponse
+
+from constants import (
+    CACHE_HIT,
+    CACHE_MISS,
+    CACHE_REVALIDATED,
+    DEFAULT_RETRIES,
+    DEFAULT_TIMEOUT,
+    DEFAULT_WORKERS,
+    PAGE_LOADING_ERROR_MESSAGE,
+    PAGE_STATUS_ERROR_MESSAGE,
+    RETRY_BACKOFF_FACTOR,
+    RETRY_STATUSES,
+)
+from utils import (
+    get_cache_key,
+    get_retry_delay,
+    parse_page_html,
+    record_cache_usage,
+)
+from timing import get_fetch_stage, record_timing
+
+# aiohttp сам распаковывает тело ответа, поэтому в кеш эти заголовки
+# попадать не должны.
+DROPPED_HEADERS = ('Content-Encoding', 'Transfer-Encoding', 'Content-Length')
+
+
+def get_validation_headers(cached_response):
+    headers = {}
+    if cached_response is None:
+        return headers
+    if 'ETag' in cached_response.headers:
+        headers['If-None-Match'] = cached_response.headers['ETag']
+    if 'Last-Modified' in cached_response.headers:
+        headers['If-Modified-Since'] = cached_response.headers['Last-Modified']
+    return headers
+
+
+def get_expires(session, url):
+    return get_expiration_datetime(
+        get_url_expiration(url, session.settings.urls_expire_after)
+        or session.settings.expire_after
+    )
+
+
+def build_response(url, status, headers, body):
+    """Собирает requests.Response, который можно сохранить в кеш."""
+    raw = HTTPResponse(
+        body=BytesIO(body),
+        headers={
+            name: value for name, value in headers.items()
+            if name not in DROPPED_HEADERS
+        },
+        status=status,
+        preload_content=False,
+        decode_content=False,
+        request_url=url,
+    )
+    return HTTPAdapter().build_response(Request('GET', url).prepare(), raw)
+
+
+def store_response(session, url, status, headers, body):
+    response = build_response(url, status, headers, body)
+    if status in session.settings.allowable_codes:
+        session.cache.save_response(
+            response, expires=get_expires(session, url)
+        )
+    return response
+
+
+async def run_blocking(function, *args):
+    """Чтение и запись кеша (SQLite и zlib) выполняются в пуле потоков,
+    чтобы не останавливать остальные загрузки в цикле событий.
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        None, function, *args
+    )
+
+
+async def wait_for_rate_limit(session, url):
+    rate_limiter = getattr(session, 'rate_limiter', None)
+    if rate_limiter is not None:
+        await asyncio.sleep(rate_limiter.reserve(url))
+
+
+async def send_request(client, semaphore, url, headers):
+    async with semaphore:
+        async with client.get(url, headers=headers) as response:
+            return response.status, response.headers, await response.read()
+
+
+def is_successful(status):
+    return 200 <= status < 300 or status == 304
+
+
+async def request_page(
+        client, session, semaphore, url, headers, retries=DEFAULT_RETRIES
+):
+    """GET-запрос с повторами, как у синхронной сессии: ошибки соединения
+    и ответы RETRY_STATUSES повторяются до retries раз с растущей паузой,
+    а ответы 429 и 503 приостанавливают запросы к хосту на время
+    из Retry-After (utils.send_request). Если повторы исчерпаны или ответ
+    не 2xx и не 304, ConnectionError.
+    """
+    rate_limiter = getattr(session, 'rate_limiter', None)
+    delay = 0
+    for attempt in range(retries + 1):
+        await asyncio.sleep(delay)
+        await wait_for_rate_limit(session, url)
+        try:
+            status, response_headers, body = await send_request(
+                client, semaphore, url, headers
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            if attempt == retries:
+                raise ConnectionError(logging.exception(
+                    PAGE_LOADING_ERROR_MESSAGE.format(url=url),
+                    stack_info=True
+                ))
+            delay = RETRY_BACKOFF_FACTOR * 2 ** attempt
+            continue
+        retry_after = get_retry_delay(
+            status, response_headers.get('Retry-After'), attempt
+        )
+        if retry_after is not None and rate_limiter is not None:
+            rate_limiter.pause(url, retry_after)
+            delay = 0
+        elif retry_after is not None:
+            delay = retry_after
+        elif status in RETRY_STATUSES:
+            delay = RETRY_BACKOFF_FACTOR * 2 ** attempt
+        else:
+            break
+    if not is_successful(status):
+        raise ConnectionError(logging.error(
+            PAGE_STATUS_ERROR_MESSAGE.format(url=url, status=status)
+        ))
+    return status, response_headers, body
+
+
+async def fetch_page(client, session, semaphore, url, retries):
+    """Время загрузки записывается без стека вложенных замеров
+    (timing.measure): корутины одного потока выполняются вперемешку.
+    """
+    start = time.perf_counter()
+    cache_key = get_cache_key(session, url)
+    cached_response = await run_blocking(session.cache.get_response, cache_key)
+    from_cache = (
+        cached_response is not None and not cached_response.is_expired
+    )
+    if from_cache:
+        record_cache_usage(CACHE_HIT, cache_key=cache_key)
+        response = cached_response
+    else:
+        status, headers, body = await request_page(
+            client, session, semaphore, url,
+            get_validation_headers(cached_response), retries
+        )
+        if status == 304 and cached_response is not None:
+            record_cache_usage(
+                CACHE_HIT, CACHE_REVALIDATED, cache_key=cache_key
+            )
+            await run_blocking(partial(
+                session.cache.save_response,
+                cached_response,
+                expires=get_expires(session, url)
+            ))
+            response = cached_response
+        else:
+            record_cache_usage(CACHE_MISS, cache_key=cache_key)
+            response = await run_blocking(
+                store_response, session, url, status, headers, body
+            )
+    record_timing(
+        get_fetch_stage(from_cache), time.perf_counter() - start
+    )
+    response.encoding = 'utf-8'
+    return response.text
+
+
+async def load_page(
+        client, session, semaphore, url, parser, parse_pool, page_parser,
+        retries
+):
+    html = await fetch_page(client, session, semaphore, url, retries)
+    parsed = await asyncio.get_running_loop().run_in_executor(
+        None, page_parser, url, html, parser, parse_pool
+    )
+    return await asyncio.wrap_future(parsed)
+
+
+async def load_all(session, urls, parser, parse_pool, page_parser, cli_args):
+    workers = getattr(cli_args, 'workers', DEFAULT_WORKERS)
+    semaphore = asyncio.Semaphore(workers)
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=workers),
+        timeout=aiohttp.ClientTimeout(
+            total=getattr(cli_args, 'timeout', DEFAULT_TIMEOUT)
+        ),
+        headers=dict(session.headers),
+    ) as client:
+        return await asyncio.gather(
+            *(
+                load_page(
+                    client, session, semaphore, url,
+                    parser, parse_pool, page_parser,
+                    getattr(cli_args, 'retries', DEFAULT_RETRIES)
+                )
+                for url in urls
+            ),
+            return_exceptions=True
+        )
+
+
+def as_future(result):
+    future = Future()
+    if isinstance(result, BaseException):
+        future.set_exception(result)
+    else:
+        future.set_result(result)
+    return future
+
+
+def load_pages(
+        session, urls, parser, cli_args=None, page_parser=parse_page_html
+):
+    """Загружает страницы асинхронно, не больше `--workers` одновременно.
+
+    Разбор выполняется в пуле потоков (или в пуле процессов сессии
+    parse_pool при `--parse-processes`) по мере загрузки страниц.
+    Возвращает завершённые Future в порядке urls, как и utils.load_pages.
+    """
+    results = asyncio.run(load_all(
+        session, urls, parser, getattr(session, 'parse_pool', None),
+        page_parser, cli_args
+    ))
+    yield from map(as_future, results)
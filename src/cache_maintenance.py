@@ -0,0 +1,115 @@
+import sqlite3
+from datetime import timedelta, timezone
+from functools import partial
+
+
+def open_cache_usage(path):
+    connection = sqlite3.connect(path)
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS usage ('
+        'cache_key TEXT PRIMARY KEY, hits INTEGER, last_used REAL)'
+    )
+    return connection
+
+
+def load_cache_usage(connection):
+    return {
+        cache_key: (hits, last_used)
+        for cache_key, hits, last_used in connection.execute(
+            'SELECT cache_key, hits, last_used FROM usage'
+        )
+    }
+
+
+def save_cache_usage(connection, usage):
+    """Добавляет попадания за текущий запуск к сохранённым."""
+    with connection:
+        connection.executemany(
+            'INSERT INTO usage VALUES (?, ?, ?) ON CONFLICT(cache_key) '
+            'DO UPDATE SET hits = hits + excluded.hits, '
+            'last_used = excluded.last_used',
+            ((cache_key, *row) for cache_key, row in usage.items())
+        )
+
+
+def forget_cache_usage(connection, cache_keys):
+    with connection:
+        connection.executemany(
+            'DELETE FROM usage WHERE cache_key = ?',
+            ((cache_key, ) for cache_key in cache_keys)
+        )
+
+
+def get_cache_entries(session):
+    """Записи кеша; повреждённые записи, которые не читаются, пропускаются."""
+    return [
+        response for response in session.cache.responses.values()
+        if response is not None
+    ]
+
+
+def get_last_used(response, usage):
+    if response.cache_key in usage:
+        return usage[response.cache_key][1]
+    created_at = response.created_at
+    return created_at.replace(
+        tzinfo=created_at.tzinfo or timezone.utc
+    ).timestamp()
+
+
+def get_stored_size(storage, response):
+    """Сколько байт запись занимает в хранилище: ответы хранятся сжатыми
+    (sessions.compressed_serializer), а response.size — размер распакованного
+    ответа. Хранилище без сериализатора (memory) держит ответы как есть.
+    """
+    if storage.serializer is None:
+        return response.size
+    return len(storage.serialize(response))
+
+
+def select_least_recently_used(responses, usage, max_size, get_size):
+    """Ключи записей, которые не помещаются в max_size байт,
+    если оставлять в кеше записи с самым поздним обращением.
+    get_size(response) возвращает размер записи.
+    """
+    evicted = []
+    size = 0
+    for response in sorted(
+        responses,
+        key=lambda response: get_last_used(response, usage),
+        reverse=True
+    ):
+        size += get_size(response)
+        if size > max_size:
+            evicted.append(response.cache_key)
+    return evicted
+
+
+def evict_cache(session, usage, ttl=None, max_size=None):
+    """Удаляет записи старше ttl секунд, а затем самые давно
+    использованные записи сверх max_size байт хранилища (сжатых записей).
+    Возвращает удалённые ключи.
+    """
+    cache_keys = set(session.cache.responses.keys())
+    if ttl is not None:
+        session.cache.delete(older_than=timedelta(seconds=ttl))
+    if max_size is not None:
+        session.cache.delete(*select_least_recently_used(
+            get_cache_entries(session),
+            usage,
+            max_size,
+            partial(get_stored_size, session.cache.responses),
+        ))
+    return cache_keys - set(session.cache.responses.keys())
+
+
+def get_storage_size(session):
+    """Размер хранилища кеша в байтах или None, если бэкенд его не сообщает."""
+    size = getattr(session.cache.responses, 'size', None)
+    return None if size is None else size()
+
+
+def vacuum_cache(session):
+    vacuum = getattr(session.cache.responses, 'vacuum', None)
+    if vacuum is not None:
+        vacuum()
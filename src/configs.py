@@ -3,19 +3,87 @@ import logging
 from logging.handlers import RotatingFileHandler
 
 from constants import (
+    BS4_ENGINE,
+    CACHE_BACKENDS,
+    DEFAULT_ARCHIVE_FORMATS,
+    DEFAULT_BURST,
+    DEFAULT_RETRIES,
+    DEFAULT_TIMEOUT,
+    DEFAULT_WORKERS,
     FILE_MOD,
+    JSONL_MOD,
     DT_FORMAT,
+    EXPIRATION_RULE_ERROR_MESSAGE,
     LOG_DIR,
     LOG_FORMAT,
     LOG_FILE,
-    PRETTY_MOD
+    LXML_ENGINE,
+    NON_NEGATIVE_NUMBER_ERROR_MESSAGE,
+    POSITIVE_FLOAT_ERROR_MESSAGE,
+    POSITIVE_NUMBER_ERROR_MESSAGE,
+    PRETTY_MOD,
+    SERVE_HOST,
+    SERVE_PORT,
+    SERVE_REFRESH_INTERVAL,
+    SQLITE_BACKEND,
+    SQLITE_MOD,
 )
 
 
+def positive_int(value):
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            POSITIVE_NUMBER_ERROR_MESSAGE.format(value=value)
+        )
+    return number
+
+
+def positive_float(value):
+    try:
+        number = float(value)
+    except ValueError:
+        number = 0
+    if not number > 0:
+        raise argparse.ArgumentTypeError(
+            POSITIVE_FLOAT_ERROR_MESSAGE.format(value=value)
+        )
+    return number
+
+
+def non_negative_int(value):
+    try:
+        number = int(value)
+    except ValueError:
+        number = -1
+    if number < 0:
+        raise argparse.ArgumentTypeError(
+            NON_NEGATIVE_NUMBER_ERROR_MESSAGE.format(value=value)
+        )
+    return number
+
+
+def expiration_rule(value):
+    pattern, _, seconds = value.rpartition('=')
+    try:
+        seconds = int(seconds)
+    except ValueError:
+        pattern = ''
+    if not pattern:
+        raise argparse.ArgumentTypeError(
+            EXPIRATION_RULE_ERROR_MESSAGE.format(value=value)
+        )
+    return pattern, seconds
+
+
 def configure_argument_parser(available_modes):
     parser = argparse.ArgumentParser(description='Парсер документации Python')
     parser.add_argument(
         'mode',
+        nargs='+',
         choices=available_modes,
         help='Режимы работы парсера'
     )
@@ -28,9 +96,143 @@ def configure_argument_parser(available_modes):
     parser.add_argument(
         '-o',
         '--output',
-        choices=(PRETTY_MOD, FILE_MOD),
+        choices=(PRETTY_MOD, FILE_MOD, JSONL_MOD, SQLITE_MOD),
         help='Дополнительные способы вывода данных'
     )
+    parser.add_argument(
+        '-w',
+        '--workers',
+        type=positive_int,
+        default=DEFAULT_WORKERS,
+        help='Количество потоков для загрузки страниц'
+    )
+    parser.add_argument(
+        '-p',
+        '--parse-processes',
+        type=positive_int,
+        help='Количество процессов для разбора загруженных страниц'
+    )
+    parser.add_argument(
+        '-e',
+        '--engine',
+        choices=(BS4_ENGINE, LXML_ENGINE),
+        default=BS4_ENGINE,
+        help='Библиотека для разбора страниц'
+    )
+    parser.add_argument(
+        '--expire',
+        action='append',
+        type=expiration_rule,
+        default=[],
+        metavar='PATTERN=SECONDS',
+        help='Срок хранения в кеше страниц, адрес которых подходит под шаблон'
+    )
+    parser.add_argument(
+        '--full',
+        action='store_true',
+        help='Проверить все PEP заново, не используя сохранённое состояние'
+    )
+    parser.add_argument(
+        '--formats',
+        nargs='+',
+        default=DEFAULT_ARCHIVE_FORMATS,
+        metavar='FORMAT',
+        help='Форматы архивов документации для загрузки'
+    )
+    parser.add_argument(
+        '--max-bandwidth',
+        type=positive_int,
+        metavar='KIB_PER_SECOND',
+        help='Общее ограничение скорости загрузки архивов, КиБ/с'
+    )
+    parser.add_argument(
+        '--retries',
+        type=non_negative_int,
+        default=DEFAULT_RETRIES,
+        help='Количество повторов запроса при временных ошибках сервера'
+    )
+    parser.add_argument(
+        '--timeout',
+        type=positive_int,
+        default=DEFAULT_TIMEOUT,
+        help='Таймаут HTTP-запроса, сек'
+    )
+    parser.add_argument(
+        '--rate',
+        type=positive_float,
+        metavar='REQUESTS_PER_SECOND',
+        help='Ограничение частоты запросов к одному хосту, запросов в секунду'
+    )
+    parser.add_argument(
+        '--burst',
+        type=positive_int,
+        default=DEFAULT_BURST,
+        help='Сколько запросов к хосту можно отправить подряд без ожидания'
+    )
+    parser.add_argument(
+        '--cache-backend',
+        choices=CACHE_BACKENDS,
+        default=SQLITE_BACKEND,
+        help='Хранилище кеша HTTP-ответов'
+    )
+    parser.add_argument(
+        '--cache-ttl',
+        type=positive_int,
+        metavar='SECONDS',
+        help='Режим cache: удалить записи кеша старше указанного срока'
+    )
+    parser.add_argument(
+        '--cache-max-size',
+        type=positive_int,
+        metavar='MIB',
+        help=(
+            'Режим cache: удалить давно использованные записи, '
+            'чтобы кеш занимал не больше указанного объёма, МиБ'
+        )
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Сохранить профиль cProfile в директорию logs'
+    )
+    parser.add_argument(
+        '--status',
+        help='Режим pep-query: статус PEP из карточки, например Accepted'
+    )
+    parser.add_argument(
+        '--type',
+        dest='pep_type',
+        help='Режим pep-query: тип PEP, например "Standards Track"'
+    )
+    parser.add_argument(
+        '--count-by',
+        choices=('status', 'type'),
+        help='Режим pep-query: вывести количество PEP по статусам или типам'
+    )
+    parser.add_argument(
+        '--host',
+        default=SERVE_HOST,
+        help='Режим serve: адрес, на котором принимать запросы'
+    )
+    parser.add_argument(
+        '--port',
+        type=positive_int,
+        default=SERVE_PORT,
+        help='Режим serve: порт HTTP API'
+    )
+    parser.add_argument(
+        '--refresh-interval',
+        type=positive_int,
+        default=SERVE_REFRESH_INTERVAL,
+        metavar='SECONDS',
+        help='Режим serve: как часто обновлять результаты, сек'
+    )
+    parser.add_argument(
+        '--async',
+        action='store_true',
+        dest='use_async',
+        help='Асинхронная загрузка страниц через aiohttp'
+    )
     return parser
 
 
@@ -5,19 +5,108 @@ MAIN_PEP_URL = 'https://peps.python.org/'
 
 PRETTY_MOD = 'pretty'
 FILE_MOD = 'file'
+JSONL_MOD = 'jsonl'
+SQLITE_MOD = 'sqlite'
+# Псевдорежим: запустить все основные режимы за один запуск.
+ALL_MODE = 'all'
+
+BS4_ENGINE = 'bs4'
+LXML_ENGINE = 'lxml'
 
 BASE_DIR = Path(__file__).parent
 DOWNLOAD_DIR = 'downloads'
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DEFAULT_ARCHIVE_FORMATS = ('pdf-a4.zip', )
+# Формат архива — часть имени файла после `docs-` или `docs.`:
+# python-3.11.0-docs-pdf-a4.zip -> pdf-a4.zip, python-3.11.0-docs.epub -> epub
+ARCHIVE_FORMAT_PATTERN = r'docs[-.](?P<format>[^/]+)$'
+ETAG_SUFFIX = '.etag'
+PART_SUFFIX = '.part'
 LOG_DIR = BASE_DIR / 'logs'
 LOG_FILE = LOG_DIR / 'parser.log'
+PROFILE_FILE = 'profile_{now}.pstats'
+PEP_STATE_FILE = 'pep_state.sqlite3'
+CACHE_USAGE_FILE = 'cache_usage.sqlite3'
+PARSE_MEMO_FILE = 'parse_memo.sqlite3'
+# Увеличивается при изменении парсеров, чтобы не использовать результаты,
+# сохранённые прежней версией.
+PARSE_MEMO_VERSION = 1
 RESULTS_DIR = 'results'
+RESULTS_DB = 'results.sqlite3'
+# Как часто, сек, сбрасывать на диск строки, выводимые по мере получения.
+OUTPUT_FLUSH_INTERVAL = 1
+
+DEFAULT_WORKERS = 10
+DEFAULT_RETRIES = 3
+DEFAULT_TIMEOUT = 30
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (500, 502, 504)
+# На эти ответы сервер может прислать Retry-After: запросы к хосту
+# приостанавливаются во всех потоках, а запрос повторяется.
+RETRY_AFTER_STATUSES = (429, 503)
+DEFAULT_BURST = 1
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+# Срок хранения страниц в кеше, сек. Используется первый подходящий шаблон.
+# По истечении срока страница запрашивается условно (If-None-Match /
+# If-Modified-Since), и ответ 304 отдаётся из кеша.
+DEFAULT_EXPIRE_AFTER = DAY
+URLS_EXPIRE_AFTER = {
+    'peps.python.org/pep-*': 7 * DAY,
+    'peps.python.org': HOUR,
+    'docs.python.org/3/whatsnew/*.html': 7 * DAY,
+    'docs.python.org': DAY,
+}
+
+# Режим serve: адрес HTTP API и как часто, сек, обновлять результаты.
+# Страницы, которые ещё не устарели в кеше, при обновлении не загружаются.
+SERVE_HOST = '127.0.0.1'
+SERVE_PORT = 8080
+SERVE_REFRESH_INTERVAL = HOUR
+
+# Этапы работы парсера для сводки по времени (--profile и лог).
+STAGE_FETCH_CACHE = 'загрузка из кеша'
+STAGE_FETCH_NETWORK = 'загрузка из сети'
+STAGE_PARSE = 'разбор HTML'
+STAGE_EXTRACT = 'извлечение данных'
+STAGE_OUTPUT = 'вывод результатов'
+STAGE_MODE = 'режим {mode}'
 
 LOG_FORMAT = '"%(asctime)s - [%(levelname)s] - %(message)s"'
 
 DATETIME_FORMAT = '%Y-%m-%d_%H-%M-%S'
 DT_FORMAT = '%d.%m.%Y %H:%M:%S'
 
+SQLITE_BACKEND = 'sqlite'
+FILESYSTEM_BACKEND = 'filesystem'
+MEMORY_BACKEND = 'memory'
+CACHE_BACKENDS = (SQLITE_BACKEND, FILESYSTEM_BACKEND, MEMORY_BACKEND)
+MIB = 1024 * 1024
+# Уровень сжатия zlib для ответов в кеше: 6 — компромисс между размером
+# и скоростью, распаковка от уровня почти не зависит.
+CACHE_COMPRESSION_LEVEL = 6
+
+CACHE_HIT = 'hits'
+CACHE_MISS = 'misses'
+CACHE_REVALIDATED = 'revalidated'
+
+ARCHIVE_NOT_FOUND_MESSAGE = (
+    'Архив в формате {format} не найден. Доступные форматы: {formats}'
+)
+CACHE_STATS_MESSAGE = (
+    'Ответов из кеша: {hits} (из них подтверждено сервером (304): '
+    '{revalidated}), загружено из сети: {misses}'
+)
+CONNECTION_STATS_MESSAGE = (
+    'HTTP-запросов: {requests}, открыто соединений: {connections}, '
+    'повторно использовано: {reused}'
+)
 CONNECTION_ERROR_MESSAGE = 'Не удалось установить соединение по ссылке {link}'
+EXPIRATION_RULE_ERROR_MESSAGE = (
+    'Ожидается правило вида ШАБЛОН=СЕКУНДЫ: {value}'
+)
+FILE_IS_UP_TO_DATE_MESSAGE = 'Файл уже загружен и не изменился: {path}'
 FILE_SAVE_MESSAGE = 'Файл был загружен и сохранён: {path}'
 FINISH_PARSING_MESSAGE = 'Парсер завершил работу.'
 HEADERS_FOR_PYTHON_DOCS_TABLE = (
@@ -27,13 +116,47 @@ HEADERS_FOR_PYTHON_VERSION_TABLE = (
     'Ссылка на документацию', 'Версия', 'Статус'
 )
 HEADERS_PEP_TABLE = ('Статус', 'Количество')
+HEADERS_PEP_RECORDS_TABLE = (
+    'PEP', 'Заголовок', 'Тип', 'Статус', 'Авторы', 'Ссылка'
+)
+HEADERS_CACHE_TABLE = ('Показатель', 'Значение')
+HEADERS_PREFETCH_TABLE = ('Страницы', 'Количество')
+HEADERS_TIMINGS_TABLE = (
+    'Этап', 'Вызовов', 'Всего, мс', 'p50, мс', 'p95, мс', 'Макс, мс'
+)
 PAGE_LOADING_ERROR_MESSAGE = 'Возникла ошибка при загрузке страницы {url}'
+PAGE_STATUS_ERROR_MESSAGE = 'Страница {url} вернула ответ {status}'
 PARSING_WITH_ARGUMENTS_MESSAGE = 'Аргументы командной строки: {args}'
 START_PARSING_MESSAGE = 'Парсер запущен!'
 MISSING_TAG_MESSAGE = 'Не найден тег {tag} {attrs}'
 NOT_FOUND_TAG_MESSAGE = 'Тэг не найден'
+PROFILE_SAVE_MESSAGE = (
+    'Профиль сохранён: {path}. Просмотр: python -m pstats {path}'
+)
+PEP_RECORDS_EMPTY_MESSAGE = (
+    'Сохранённых записей PEP нет: сначала выполните режим pep'
+)
 PROGRAM_ERROR_MESSAGE = 'Сбой в работе программы: {error}'
+MODE_ERROR_MESSAGE = 'Сбой в режиме {mode}: {error}'
+MODE_NOT_ALONE_MESSAGE = (
+    'Режим {mode} нельзя запускать вместе с другими режимами: {modes}'
+)
+MODE_NOT_READY_MESSAGE = 'Результаты режима {mode} ещё не получены'
+REFRESH_ERROR_MESSAGE = 'Сбой при обновлении результатов: {error}'
+SERVE_START_MESSAGE = (
+    'HTTP API запущено на http://{host}:{port}/, '
+    'результаты обновляются раз в {interval} сек'
+)
+UNKNOWN_MODE_MESSAGE = 'Режим {mode} не отдаётся через API'
 PYTHON_VERSION_ERROR_MESSAGE = 'Версий Python не найдено'
+NON_NEGATIVE_NUMBER_ERROR_MESSAGE = (
+    'Ожидается неотрицательное целое число: {value}'
+)
+POSITIVE_FLOAT_ERROR_MESSAGE = 'Ожидается число больше нуля: {value}'
+POSITIVE_NUMBER_ERROR_MESSAGE = 'Ожидается целое число больше нуля: {value}'
+TIMINGS_MESSAGE = (
+    'Время по этапам (без вложенных этапов того же потока):\n{table}'
+)
 UNEXPECTED_PEP_STATUS_MESSAGE = (
     '{pep_link}\nСтатус в карточке pep: {status}\n'
     'Ожидаемые статусы: {expected_status}'
@@ -49,3 +172,13 @@ EXPECTED_STATUS = {
     'W': ('Withdrawn',),
     '': ('Draft', 'Active',),
 }
+# Первая буква кода в индексе PEP — тип, остальное — статус.
+PEP_TYPES = {
+    'I': 'Informational',
+    'P': 'Process',
+    'S': 'Standards Track',
+}
+# Колонки строки индекса PEP: тип и статус, номер, заголовок, авторы.
+PEP_INDEX_COLUMNS = 4
+# Номер колонки с номером PEP и ссылкой на карточку, с нуля.
+PEP_INDEX_NUMBER_COLUMN = 1
@@ -0,0 +1,134 @@
+"""Разбор страниц напрямую через lxml, без построения дерева BeautifulSoup.
+
+Функции повторяют интерфейс модуля `parsers` и возвращают те же значения.
+"""
+from itertools import groupby
+
+from lxml import etree, html as lxml_html
+
+from constants import (
+    MISSING_TAG_MESSAGE,
+    PEP_INDEX_COLUMNS,
+    PEP_INDEX_NUMBER_COLUMN,
+    PYTHON_VERSION_ERROR_MESSAGE,
+    STAGE_PARSE,
+)
+from exceptions import ParserFindTagException
+from timing import timed
+
+PEP_CARD_DL = etree.XPath('(//dl)[1]')
+PEP_CARD_STATUS = etree.XPath(
+    './/*[text()="Status"][1]/following-sibling::*[1]'
+)
+# id() находит раздел по таблице id-атрибутов libxml2, без обхода всего
+# документа, как //*[@id=...].
+PEP_INDEX_CELLS = etree.XPath('id("numerical-index")//tbody/tr/td')
+PEP_INDEX_LINKS = etree.XPath(
+    'id("numerical-index")//tbody/tr'
+    f'/td[{PEP_INDEX_NUMBER_COLUMN + 1}]/descendant::a[1]/@href',
+    smart_strings=False
+)
+VERSIONS_MENU_LISTS = etree.XPath(
+    '//div[contains(concat(" ", normalize-space(@class), " "),'
+    ' " menu-wrapper ")]//ul'
+)
+VERSION_LINKS = etree.XPath('.//a')
+VERSION_H1 = etree.XPath('(//h1)[1]')
+VERSION_DL = etree.XPath('(//dl)[1]')
+WHATS_NEW_LINKS = etree.XPath(
+    '//*[@id="what-s-new-in-python"]'
+    '//div[contains(concat(" ", normalize-space(@class), " "),'
+    ' " toctree-wrapper ")]'
+    '//li[contains(concat(" ", normalize-space(@class), " "),'
+    ' " toctree-l1 ")]'
+    '/descendant::a[1]/@href'
+)
+
+
+def make_tree(html):
+    with timed(STAGE_PARSE):
+        try:
+            return lxml_html.fromstring(html)
+        except etree.ParserError:
+            # На пустой странице lxml падает с "Document is empty", а
+            # BeautifulSoup строит пустое дерево: дальше поиск тегов
+            # ведёт себя одинаково в обоих движках.
+            return lxml_html.Element('html')
+
+
+def find_element(xpath, element, tag):
+    found = xpath(element)
+    if not found:
+        raise ParserFindTagException(
+            MISSING_TAG_MESSAGE.format(tag=tag, attrs=None)
+        )
+    return found[0]
+
+
+def parse_pep_status(html):
+    dl = find_element(PEP_CARD_DL, make_tree(html), 'dl')
+    return find_element(PEP_CARD_STATUS, dl, 'dd').text_content()
+
+
+def parse_version_info(html):
+    root = make_tree(html)
+    return (
+        find_element(VERSION_H1, root, 'h1').text_content(),
+        find_element(
+            VERSION_DL, root, 'dl'
+        ).text_content().replace('\n', ' ')
+    )
+
+
+def extract_pep_index(html, columns):
+    """Строки числового индекса: все ячейки и ссылки выбираются двумя
+    XPath-запросами, повторы номера PEP пропускаются.
+    """
+    root = make_tree(html)
+    rows = [list(row) for _, row in groupby(
+        PEP_INDEX_CELLS(root), key=etree._Element.getparent
+    )]
+    links = PEP_INDEX_LINKS(root)
+    if any(len(row) < columns for row in rows):
+        raise ParserFindTagException(
+            MISSING_TAG_MESSAGE.format(tag='td', attrs=None)
+        )
+    if len(links) != len(rows):
+        raise ParserFindTagException(
+            MISSING_TAG_MESSAGE.format(tag='a', attrs=None)
+        )
+    index = {}
+    for link, row in zip(links, rows):
+        number = row[PEP_INDEX_NUMBER_COLUMN].text_content()
+        if number not in index:
+            index[number] = (
+                link, *(cell.text_content() for cell in row[:columns])
+            )
+    return list(index.values())
+
+
+def parse_pep_index(html):
+    return [
+        (href, code[1:])
+        for href, code, _ in extract_pep_index(
+            html, PEP_INDEX_NUMBER_COLUMN + 1
+        )
+    ]
+
+
+def parse_pep_index_records(html):
+    return extract_pep_index(html, PEP_INDEX_COLUMNS)
+
+
+def parse_whats_new_index(html):
+    return [str(href) for href in WHATS_NEW_LINKS(make_tree(html))]
+
+
+def parse_latest_versions(html):
+    for ul in VERSIONS_MENU_LISTS(make_tree(html)):
+        if 'All versions' in ul.text_content():
+            return [
+                (a_tag.get('href'), a_tag.text_content())
+                for a_tag in VERSION_LINKS(ul)
+            ]
+    raise RuntimeError(PYTHON_VERSION_ERROR_MESSAGE)
@@ -1,127 +1,349 @@
+import cProfile
+import datetime as dt
 import logging
+import pstats
 import re
-from collections import defaultdict
+from importlib import import_module
+from argparse import Namespace
+from collections import Counter, defaultdict
+from contextlib import closing, nullcontext
+from functools import partial
+from threading import Event, Lock, Thread, setprofile
 from urllib.parse import urljoin
 
-import requests_cache
-from tqdm import tqdm
+from requests import RequestException
 
 from configs import configure_argument_parser, configure_logging
 from constants import (
+    ALL_MODE,
+    ARCHIVE_FORMAT_PATTERN,
+    ARCHIVE_NOT_FOUND_MESSAGE,
     BASE_DIR,
+    BS4_ENGINE,
+    CACHE_HIT,
+    CACHE_MISS,
+    CACHE_REVALIDATED,
+    CACHE_STATS_MESSAGE,
+    CACHE_USAGE_FILE,
     CONNECTION_ERROR_MESSAGE,
+    CONNECTION_STATS_MESSAGE,
+    DATETIME_FORMAT,
+    DEFAULT_ARCHIVE_FORMATS,
+    DEFAULT_WORKERS,
     DOWNLOAD_DIR,
+    FILE_IS_UP_TO_DATE_MESSAGE,
     FILE_SAVE_MESSAGE,
     FINISH_PARSING_MESSAGE,
     EXPECTED_STATUS,
+    HEADERS_CACHE_TABLE,
     HEADERS_FOR_PYTHON_DOCS_TABLE,
     HEADERS_FOR_PYTHON_VERSION_TABLE,
+    HEADERS_PEP_RECORDS_TABLE,
     HEADERS_PEP_TABLE,
+    HEADERS_PREFETCH_TABLE,
+    LOG_DIR,
+    LXML_ENGINE,
     MAIN_DOC_URL,
     MAIN_PEP_URL,
+    MIB,
+    MODE_ERROR_MESSAGE,
+    MODE_NOT_ALONE_MESSAGE,
     NOT_FOUND_TAG_MESSAGE,
+    PARSE_MEMO_FILE,
     PARSING_WITH_ARGUMENTS_MESSAGE,
+    PEP_RECORDS_EMPTY_MESSAGE,
+    PEP_STATE_FILE,
+    PEP_TYPES,
+    PROFILE_FILE,
+    PROFILE_SAVE_MESSAGE,
     PROGRAM_ERROR_MESSAGE,
-    PYTHON_VERSION_ERROR_MESSAGE,
+    SERVE_HOST,
+    SERVE_PORT,
+    SERVE_REFRESH_INTERVAL,
+    SERVE_START_MESSAGE,
+    STAGE_MODE,
+    STAGE_OUTPUT,
     START_PARSING_MESSAGE,
+    TIMINGS_MESSAGE,
     UNEXPECTED_PEP_STATUS_MESSAGE,
 )
 from exceptions import ParserFindTagException
-from outputs import control_output
-from utils import find_tag, get_soup
+from cache_maintenance import (
+    evict_cache,
+    forget_cache_usage,
+    get_cache_entries,
+    get_storage_size,
+    load_cache_usage,
+    open_cache_usage,
+    save_cache_usage,
+    vacuum_cache,
+)
+from outputs import control_output, format_table
+from parse_memo import load_parse_memo, open_parse_memo, save_parse_memo
+from pep_index import build_indexes, count_records, select_records
+from pep_state import (
+    PepRecord,
+    PepState,
+    load_pep_records,
+    load_pep_state,
+    open_pep_state,
+    save_pep_records,
+    save_pep_state,
+)
+from server import create_server, refresh_periodically, set_results
+from throttling import TokenBucket
+from timing import reset_timings, summarize_timings, timed, timed_rows
+from utils import (
+    cache_stats,
+    cache_usage,
+    download_file,
+    get_cache_status,
+    get_response,
+    get_soup,
+    is_cache_fresh,
+    load_pages,
+    open_parse_pool,
+    parse_changed_page,
+    parse_memo,
+    parse_memo_changed,
+    parse_page_html,
+    progress_bar,
+    run_concurrently,
+)
+
+# Модули движков импортируются при первом использовании: bs4 и lxml
+# загружаются, только если режиму нужен разбор страниц.
+ENGINES = {
+    BS4_ENGINE: 'parsers',
+    LXML_ENGINE: 'lxml_parsers',
+}
+
+
+def get_engine(cli_args=None):
+    return import_module(ENGINES[getattr(cli_args, 'engine', BS4_ENGINE)])
+
+
+def get_page_loader(cli_args=None):
+    if getattr(cli_args, 'use_async', False):
+        return import_module('async_engine').load_pages
+    return load_pages
 
 
-def whats_new(session):
+def load_page(session, url, parser, cli_args=None):
+    [page] = get_page_loader(cli_args)(session, [url], parser, cli_args)
+    return page.result()
+
+
+def iter_whats_new(session, cli_args=None):
+    """Строки результата whats-new, которые отдаются по мере загрузки
+    статей, чтобы вывод в файл начинался до окончания работы.
+    """
     whats_new_url = urljoin(MAIN_DOC_URL, 'whatsnew/')
-    results = [HEADERS_FOR_PYTHON_DOCS_TABLE, ]
+    yield HEADERS_FOR_PYTHON_DOCS_TABLE
     logs = []
-    for section in tqdm(get_soup(
-            session, whats_new_url
-    ).select(
-        '#what-s-new-in-python div.toctree-wrapper li.toctree-l1'
-    )):
-        version_link = urljoin(whats_new_url, section.find('a')['href'])
+    engine = get_engine(cli_args)
+    version_links = [
+        urljoin(whats_new_url, href)
+        for href in load_page(
+            session, whats_new_url, engine.parse_whats_new_index, cli_args
+        )
+    ]
+    pages = get_page_loader(cli_args)(
+        session, version_links, engine.parse_version_info, cli_args
+    )
+    for version_link, page in progress_bar(
+            zip(version_links, pages), total=len(version_links)
+    ):
         try:
-            soup = get_soup(session, version_link)
-            results.append(
-                (
-                    version_link,
-                    find_tag(soup, 'h1').text,
-                    find_tag(soup, 'dl').text.replace('\n', ' ')
-                )
-            )
+            version_info = page.result()
         except ConnectionError:
             logs.append(CONNECTION_ERROR_MESSAGE.format(link=version_link))
             continue
+        yield (version_link, *version_info)
     for log in logs:
         logging.info(log)
-    return results
 
 
-def latest_versions(session):
-    ul_tags = get_soup(session, MAIN_DOC_URL).select('div.menu-wrapper ul')
-    for ul in ul_tags:
-        if 'All versions' in ul.text:
-            a_tags = ul.find_all('a')
-            break
-    else:
-        raise RuntimeError(PYTHON_VERSION_ERROR_MESSAGE)
+def whats_new(session, cli_args=None):
+    return list(iter_whats_new(session, cli_args))
+
+
+def latest_versions(session, cli_args=None):
     results = [HEADERS_FOR_PYTHON_VERSION_TABLE, ]
     pattern = r'Python (?P<version>\d\.\d+) \((?P<status>.*)\)'
-    for a_tag in a_tags:
-        text_match = re.search(pattern, a_tag.text)
+    for href, text in load_page(
+        session,
+        MAIN_DOC_URL,
+        get_engine(cli_args).parse_latest_versions,
+        cli_args
+    ):
+        text_match = re.search(pattern, text)
         if text_match:
             version, status = text_match.groups()
         else:
-            version, status = a_tag.text, ''
-        results.append((a_tag['href'], version, status))
+            version, status = text, ''
+        results.append((href, version, status))
     return results
 
 
-def download(session):
+def get_archive_links(session, downloads_url, formats):
+    archive_links = {}
+    for a_tag in get_soup(session, downloads_url).select(
+        'table.docutils td > a[href]'
+    ):
+        format_match = re.search(ARCHIVE_FORMAT_PATTERN, a_tag['href'])
+        if format_match:
+            archive_links[format_match['format']] = urljoin(
+                downloads_url, a_tag['href']
+            )
+    for archive_format in formats:
+        if archive_format not in archive_links:
+            logging.info(ARCHIVE_NOT_FOUND_MESSAGE.format(
+                format=archive_format, formats=', '.join(archive_links)
+            ))
+    return [
+        archive_links[archive_format] for archive_format in formats
+        if archive_format in archive_links
+    ]
+
+
+def download(session, cli_args=None):
     downloads_url = urljoin(MAIN_DOC_URL, 'download.html')
-    pdf_a4_tag = get_soup(session, downloads_url).select_one(
-        'table.docutils td > a[href$="pdf-a4.zip"]'
+    archive_urls = get_archive_links(
+        session,
+        downloads_url,
+        getattr(cli_args, 'formats', DEFAULT_ARCHIVE_FORMATS)
     )
-    archive_url = urljoin(downloads_url, pdf_a4_tag['href'])
-    filename = archive_url.split('/')[-1]
     download_dir = BASE_DIR / DOWNLOAD_DIR
     download_dir.mkdir(exist_ok=True)
-    archive_path = download_dir / filename
-    with open(archive_path, 'wb') as file:
-        file.write(session.get(archive_url).content)
-    logging.info(FILE_SAVE_MESSAGE.format(path=archive_path))
+    archive_paths = [
+        download_dir / archive_url.split('/')[-1]
+        for archive_url in archive_urls
+    ]
+    max_bandwidth = getattr(cli_args, 'max_bandwidth', None)
+    limiter = TokenBucket(max_bandwidth * 1024) if max_bandwidth else None
+    downloads = run_concurrently(
+        lambda position: download_file(
+            session,
+            archive_urls[position],
+            archive_paths[position],
+            limiter,
+            position
+        ),
+        range(len(archive_urls)),
+        getattr(cli_args, 'workers', DEFAULT_WORKERS)
+    )
+    for archive_url, archive_path, downloaded in zip(
+            archive_urls, archive_paths, downloads
+    ):
+        try:
+            if downloaded.result():
+                logging.info(FILE_SAVE_MESSAGE.format(path=archive_path))
+            else:
+                logging.info(
+                    FILE_IS_UP_TO_DATE_MESSAGE.format(path=archive_path)
+                )
+        except RequestException:
+            logging.exception(
+                CONNECTION_ERROR_MESSAGE.format(link=archive_url)
+            )
 
 
-def pep(session):
+def is_pep_outdated(session, pep_link, status, known):
+    return (
+        known is None
+        or known.index_status != status
+        or not is_cache_fresh(session, pep_link)
+    )
+
+
+def update_pep_state(session, state, peps, cli_args=None):
+    """Перепроверяет PEP, у которых изменилась строка в общей таблице
+    или устарела страница в кеше. Неизменившиеся страницы не разбираются.
+    """
     logs = []
-    statuses_count = defaultdict(int)
-    for pep in tqdm(get_soup(
-        session, MAIN_PEP_URL
-    ).select(
-        '#numerical-index tbody tr'
-    )):
-        pep_link = urljoin(MAIN_PEP_URL, pep.find('a')['href'])
+    outdated = [
+        (pep_link, status) for pep_link, status in peps
+        if is_pep_outdated(session, pep_link, status, state.get(pep_link))
+    ]
+    pages = get_page_loader(cli_args)(
+        session,
+        [pep_link for pep_link, _ in outdated],
+        get_engine(cli_args).parse_pep_status,
+        cli_args,
+        page_parser=partial(parse_changed_page, {
+            pep_link: known.content_hash for pep_link, known in state.items()
+        })
+    )
+    for (pep_link, status), page in progress_bar(
+            zip(outdated, pages), total=len(outdated)
+    ):
         try:
-            status = find_tag(pep, 'td').text[1:]
-            status_page = find_tag(
-                get_soup(session, pep_link), 'dl'
-            ).find(
-                string='Status'
-            ).parent.find_next_sibling().text
-            if status_page not in EXPECTED_STATUS[status]:
-                logs.append(
-                    UNEXPECTED_PEP_STATUS_MESSAGE.format(
-                        pep_link=pep_link,
-                        status=status_page,
-                        expected_status=EXPECTED_STATUS[status],
-                    )
-                )
-            statuses_count[status_page] += 1
+            status_page, content_hash = page.result()
         except ConnectionError:
             logs.append(CONNECTION_ERROR_MESSAGE.format(link=pep_link))
         except ParserFindTagException:
             logs.append(NOT_FOUND_TAG_MESSAGE)
+        else:
+            if status_page is None:
+                status_page = state[pep_link].page_status
+            state[pep_link] = PepState(status, status_page, content_hash)
+    return logs
+
+
+def get_pep_records(index, state):
+    """Записи для pep-query: строки индекса и статусы из карточек PEP."""
+    return [
+        PepRecord(
+            number=int(number),
+            title=title,
+            type=PEP_TYPES.get(code[:1], code[:1]),
+            index_status=code[1:],
+            page_status=state[pep_link].page_status,
+            authors=authors,
+            link=pep_link,
+        )
+        for pep_link, code, number, title, authors in index
+        if pep_link in state
+    ]
+
+
+def pep(session, cli_args=None):
+    index = [
+        (urljoin(MAIN_PEP_URL, href), *row)
+        for href, *row in load_page(
+            session,
+            MAIN_PEP_URL,
+            get_engine(cli_args).parse_pep_index_records,
+            cli_args
+        )
+    ]
+    peps = [(pep_link, code[1:]) for pep_link, code, *_ in index]
+    with closing(open_pep_state(BASE_DIR / PEP_STATE_FILE)) as connection:
+        state = (
+            {} if getattr(cli_args, 'full', False)
+            else load_pep_state(connection)
+        )
+        logs = update_pep_state(session, state, peps, cli_args)
+        save_pep_state(connection, {
+            pep_link: state[pep_link]
+            for pep_link, _ in peps if pep_link in state
+        })
+        save_pep_records(connection, get_pep_records(index, state))
+    statuses_count = defaultdict(int)
+    for pep_link, status in peps:
+        if pep_link not in state:
+            continue
+        status_page = state[pep_link].page_status
+        if status_page not in EXPECTED_STATUS[status]:
+            logs.append(
+                UNEXPECTED_PEP_STATUS_MESSAGE.format(
+                    pep_link=pep_link,
+                    status=status_page,
+                    expected_status=EXPECTED_STATUS[status],
+                )
+            )
+        statuses_count[status_page] += 1
     for log in logs:
         logging.info(log)
     return [
@@ -131,27 +353,412 @@ def pep(session):
     ]
 
 
+# --count-by -> поле записи PEP и заголовок колонки.
+COUNT_BY_FIELDS = {
+    'status': ('page_status', 'Статус'),
+    'type': ('type', 'Тип'),
+}
+
+
+def pep_query(session, cli_args=None):
+    """Выборка из записей, сохранённых режимом pep, без загрузки страниц:
+    PEP со статусом --status и типом --type или, с --count-by,
+    количество таких PEP по статусам или типам.
+    """
+    with closing(open_pep_state(BASE_DIR / PEP_STATE_FILE)) as connection:
+        records = load_pep_records(connection)
+    if not records:
+        logging.info(PEP_RECORDS_EMPTY_MESSAGE)
+    records = select_records(
+        records,
+        build_indexes(records),
+        page_status=getattr(cli_args, 'status', None),
+        type=getattr(cli_args, 'pep_type', None),
+    )
+    count_by = getattr(cli_args, 'count_by', None)
+    if count_by is not None:
+        field, title = COUNT_BY_FIELDS[count_by]
+        return [
+            (title, 'Количество'),
+            *sorted(count_records(records, field).items()),
+            ('Total', len(records)),
+        ]
+    return [
+        HEADERS_PEP_RECORDS_TABLE,
+        *(
+            (
+                record.number,
+                record.title,
+                record.type,
+                record.page_status,
+                record.authors,
+                record.link,
+            )
+            for record in records
+        ),
+    ]
+
+
+def cache(session, cli_args=None):
+    """Обслуживание кеша: удаляет записи старше --cache-ttl и давно
+    использованные записи сверх --cache-max-size, сжимает хранилище
+    и выводит сводку по оставшимся записям.
+    """
+    max_size = getattr(cli_args, 'cache_max_size', None)
+    with closing(open_cache_usage(BASE_DIR / CACHE_USAGE_FILE)) as connection:
+        usage = load_cache_usage(connection)
+        evicted = evict_cache(
+            session,
+            usage,
+            ttl=getattr(cli_args, 'cache_ttl', None),
+            max_size=None if max_size is None else max_size * MIB,
+        )
+        forget_cache_usage(connection, evicted)
+    vacuum_cache(session)
+    responses = get_cache_entries(session)
+    storage_size = get_storage_size(session)
+    return [
+        HEADERS_CACHE_TABLE,
+        ('Удалено записей', len(evicted)),
+        ('Записей в кеше', len(responses)),
+        ('Размер ответов, КиБ', sum(
+            response.size for response in responses
+        ) // 1024),
+        ('Размер хранилища, КиБ', (
+            '-' if storage_size is None else storage_size // 1024
+        )),
+        ('Попаданий в кеш', sum(
+            usage[response.cache_key][0] for response in responses
+            if response.cache_key in usage
+        )),
+    ]
+
+
+def load_index(session, url, parser):
+    """Состояние страницы индекса в кеше и результат её разбора."""
+    response = get_response(session, url)
+    return (
+        get_cache_status(response),
+        parse_page_html(url, response.text, parser).result(),
+    )
+
+
+def prefetch_page(session, url):
+    return get_cache_status(get_response(session, url))
+
+
+def prefetch(session, cli_args=None):
+    """Заполняет кеш: загружает индексы PEP и whats-new и все страницы,
+    на которые они ссылаются, в `-w` потоков. Разбираются только индексы.
+    Выводит, сколько страниц было свежими в кеше, перепроверено
+    условным запросом (ответ 304) и загружено заново.
+    """
+    engine = get_engine(cli_args)
+    whats_new_url = urljoin(MAIN_DOC_URL, 'whatsnew/')
+    pep_status, pep_index = load_index(
+        session, MAIN_PEP_URL, engine.parse_pep_index
+    )
+    whats_new_status, whats_new_index = load_index(
+        session, whats_new_url, engine.parse_whats_new_index
+    )
+    statuses = Counter((pep_status, whats_new_status))
+    links = list(dict.fromkeys([
+        *(urljoin(MAIN_PEP_URL, href) for href, _ in pep_index),
+        *(urljoin(whats_new_url, href) for href in whats_new_index),
+    ]))
+    pages = run_concurrently(
+        partial(prefetch_page, session),
+        links,
+        getattr(cli_args, 'workers', DEFAULT_WORKERS)
+    )
+    logs = []
+    for link, page in progress_bar(zip(links, pages), total=len(links)):
+        try:
+            statuses[page.result()] += 1
+        except ConnectionError:
+            logs.append(CONNECTION_ERROR_MESSAGE.format(link=link))
+    for log in logs:
+        logging.info(log)
+    return [
+        HEADERS_PREFETCH_TABLE,
+        ('Свежие в кеше', statuses[CACHE_HIT]),
+        ('Перепроверены', statuses[CACHE_REVALIDATED]),
+        ('Загружены', statuses[CACHE_MISS]),
+        ('Ошибки загрузки', len(logs)),
+        ('Total', sum(statuses.values()) + len(logs)),
+    ]
+
+
+def save_usage():
+    """Сохраняет накопленные обращения к кешу и обнуляет их, чтобы
+    при следующем сохранении (режим serve) они не учитывались дважды.
+    """
+    with closing(open_cache_usage(BASE_DIR / CACHE_USAGE_FILE)) as connection:
+        save_cache_usage(connection, cache_usage)
+    cache_usage.clear()
+
+
+def load_memo():
+    with closing(open_parse_memo(BASE_DIR / PARSE_MEMO_FILE)) as connection:
+        parse_memo.update(load_parse_memo(connection))
+
+
+def save_memo():
+    with closing(open_parse_memo(BASE_DIR / PARSE_MEMO_FILE)) as connection:
+        save_parse_memo(connection, parse_memo, parse_memo_changed)
+    parse_memo_changed.clear()
+
+
+# Режимы, результаты которых serve держит в памяти и отдаёт по HTTP.
+SERVE_MODES = ('pep', 'whats-new', 'latest-versions')
+
+
+def get_mode_results(session, cli_args, mode):
+    with timed(STAGE_MODE.format(mode=mode)):
+        return MODE_TO_FUNCTION[mode](
+            session, replace_args(cli_args, mode=mode)
+        )
+
+
+def refresh_results(session, cli_args, results):
+    """Выполняет SERVE_MODES одновременно и заменяет их результаты
+    в results. При сбое режима остаётся его прежний результат.
+    Время этапов выводится в лог за каждое обновление отдельно.
+    """
+    runs = run_concurrently(
+        partial(get_mode_results, session, cli_args),
+        SERVE_MODES,
+        len(SERVE_MODES)
+    )
+    for mode, run in zip(SERVE_MODES, runs):
+        try:
+            set_results(results, mode, run.result())
+        except Exception as error:
+            logging.exception(
+                MODE_ERROR_MESSAGE.format(mode=mode, error=error)
+            )
+    save_usage()
+    save_memo()
+    logging.info(TIMINGS_MESSAGE.format(
+        table=format_table(summarize_timings(reset_timings()))
+    ))
+
+
+def serve(session, cli_args=None):
+    """Держит в памяти результаты SERVE_MODES и отдаёт их по HTTP в JSON.
+
+    Сессия, кеш и parse_memo остаются «тёплыми» между обновлениями,
+    которые идут в фоне раз в --refresh-interval секунд. Работает
+    до остановки по Ctrl+C и ничего не выводит.
+    """
+    results = dict.fromkeys(SERVE_MODES)
+    interval = getattr(cli_args, 'refresh_interval', SERVE_REFRESH_INTERVAL)
+    server = create_server(
+        (
+            getattr(cli_args, 'host', SERVE_HOST),
+            getattr(cli_args, 'port', SERVE_PORT),
+        ),
+        results
+    )
+    stop = Event()
+    refresher = Thread(target=refresh_periodically, args=(
+        partial(refresh_results, session, cli_args, results), interval, stop
+    ))
+    refresher.start()
+    host, port = server.server_address[:2]
+    logging.info(SERVE_START_MESSAGE.format(
+        host=host, port=port, interval=interval
+    ))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+        refresher.join()
+
+
 MODE_TO_FUNCTION = {
     'whats-new': whats_new,
     'latest-versions': latest_versions,
     'download': download,
     'pep': pep,
+    'pep-query': pep_query,
+    'cache': cache,
+    'prefetch': prefetch,
+    'serve': serve,
 }
+# Режимы, строки которых можно выводить по мере получения.
+MODE_TO_ROWS = {
+    'whats-new': iter_whats_new,
+}
+
+
+# Режимы, которые запускает `all`. Обслуживание кеша (cache, prefetch)
+# в него не входит: оно не должно идти одновременно с другими режимами.
+BATCH_MODES = ('whats-new', 'latest-versions', 'download', 'pep')
+
+
+# Режимы, которые запускаются только поодиночке. serve работает до
+# остановки по Ctrl+C и должен выполняться в главном потоке: в потоке
+# run_modes прерывание до него не дошло бы. cache удаляет записи кеша,
+# а prefetch заполняет его, поэтому они не должны идти одновременно
+# с режимами, которые читают кеш.
+ALONE_MODES = ('serve', 'cache', 'prefetch')
+
+
+def get_modes(cli_args):
+    """Режимы запуска в порядке аргументов, без повторов.
+
+    ValueError, если ALONE_MODES указаны вместе с другими режимами.
+    """
+    modes = []
+    for mode in cli_args.mode:
+        modes.extend(BATCH_MODES if mode == ALL_MODE else [mode])
+    modes = list(dict.fromkeys(modes))
+    for mode in ALONE_MODES:
+        if mode in modes and len(modes) > 1:
+            raise ValueError(MODE_NOT_ALONE_MESSAGE.format(
+                mode=mode, modes=', '.join(modes)
+            ))
+    return modes
+
+
+def count_concurrent_modes(modes):
+    """Сколько режимов работает одновременно: serve выполняет
+    одновременно все SERVE_MODES.
+    """
+    return len(SERVE_MODES) if 'serve' in modes else len(modes)
+
+
+def replace_args(cli_args, **changes):
+    return Namespace(**{**vars(cli_args), **changes})
+
+
+def run_mode(session, cli_args, output_lock=None):
+    """Выполняет режим cli_args.mode и выводит результат.
+
+    output_lock задаётся, когда режимы работают одновременно: тогда
+    строки не выводятся по мере получения, а результат режима выводится
+    целиком под блокировкой, не перемешиваясь с выводом других режимов.
+    """
+    stage = STAGE_MODE.format(mode=cli_args.mode)
+    if cli_args.mode in MODE_TO_ROWS and output_lock is None:
+        results = timed_rows(
+            stage, MODE_TO_ROWS[cli_args.mode](session, cli_args)
+        )
+    else:
+        with timed(stage):
+            results = MODE_TO_FUNCTION[cli_args.mode](session, cli_args)
+    if results:
+        with output_lock or nullcontext(), timed(STAGE_OUTPUT):
+            control_output(results, cli_args)
+
+
+def run_modes(session, cli_args, modes):
+    """Выполняет режимы одновременно с общей сессией; результат каждого
+    режима выводится, как только он завершится. Сбой одного режима
+    не останавливает остальные.
+    """
+    if len(modes) == 1:
+        return run_mode(session, replace_args(cli_args, mode=modes[0]))
+    output_lock = Lock()
+    runs = run_concurrently(
+        lambda mode: run_mode(
+            session, replace_args(cli_args, mode=mode), output_lock
+        ),
+        modes,
+        len(modes)
+    )
+    for mode, run in zip(modes, runs):
+        try:
+            run.result()
+        except Exception as error:
+            logging.exception(
+                MODE_ERROR_MESSAGE.format(mode=mode, error=error)
+            )
+
+
+def run_profiled(function, *args):
+    """Выполняет function под cProfile и сохраняет профиль в LOG_DIR.
+    Режимы и загрузки работают в потоках, поэтому каждый поток, запущенный
+    за время работы, получает свой профилировщик, а статистика всех
+    потоков объединяется в один профиль.
+    """
+    profilers = [cProfile.Profile()]
+    profilers_lock = Lock()
+
+    def profile_thread(frame, event, arg):
+        # Вызывается при первом событии в новом потоке; enable заменяет
+        # эту функцию профилировщиком потока.
+        profiler = cProfile.Profile()
+        with profilers_lock:
+            profilers.append(profiler)
+        profiler.enable()
+
+    setprofile(profile_thread)
+    try:
+        return profilers[0].runcall(function, *args)
+    finally:
+        setprofile(None)
+        with profilers_lock:
+            stats = pstats.Stats(*profilers)
+        path = LOG_DIR / PROFILE_FILE.format(
+            now=dt.datetime.now().strftime(DATETIME_FORMAT)
+        )
+        stats.dump_stats(path)
+        logging.info(PROFILE_SAVE_MESSAGE.format(path=path))
 
 
 def main():
     configure_logging()
     logging.info(START_PARSING_MESSAGE)
-    args = configure_argument_parser(MODE_TO_FUNCTION.keys()).parse_args()
+    parser = configure_argument_parser((*MODE_TO_FUNCTION, ALL_MODE))
+    args = parser.parse_args()
     logging.info(PARSING_WITH_ARGUMENTS_MESSAGE.format(args=args))
     try:
-        session = requests_cache.CachedSession()
+        modes = get_modes(args)
+    except ValueError as error:
+        parser.error(str(error))
+    # requests_cache импортируется после разбора аргументов,
+    # чтобы `-h` и ошибки в аргументах выводились без задержки.
+    from sessions import create_session, get_connection_stats
+
+    try:
+        # Пул соединений рассчитан на все режимы, работающие одновременно.
+        session = create_session(replace_args(
+            args, workers=args.workers * count_concurrent_modes(modes)
+        ))
         if args.clear_cache:
             session.cache.clear()
-        parser_mode = args.mode
-        results = MODE_TO_FUNCTION[parser_mode](session)
-        if results:
-            control_output(results, args)
+        load_memo()
+        # Пул процессов разбора один на весь запуск: запуск процессов
+        # занимает заметное время, а страницы загружают все режимы.
+        with open_parse_pool(args) as parse_pool:
+            session.parse_pool = parse_pool
+            if args.profile:
+                run_profiled(run_modes, session, args, modes)
+            else:
+                run_modes(session, args, modes)
+        if cache_usage:
+            save_usage()
+        if parse_memo_changed:
+            save_memo()
+        logging.info(CACHE_STATS_MESSAGE.format(
+            hits=cache_stats[CACHE_HIT],
+            revalidated=cache_stats[CACHE_REVALIDATED],
+            misses=cache_stats[CACHE_MISS],
+        ))
+        requests_count, connections_count = get_connection_stats(session)
+        logging.info(CONNECTION_STATS_MESSAGE.format(
+            requests=requests_count,
+            connections=connections_count,
+            reused=requests_count - connections_count,
+        ))
+        logging.info(TIMINGS_MESSAGE.format(
+            table=format_table(summarize_timings())
+        ))
     except Exception as error:
         logging.exception(
             msg=PROGRAM_ERROR_MESSAGE.format(error=error),
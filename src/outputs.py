@@ -1,46 +1,134 @@
 import csv
 import datetime as dt
+import json
 import logging
-
-from prettytable import PrettyTable
+import sqlite3
+import sys
+import time
+from contextlib import closing
 
 from constants import (
     BASE_DIR,
     DATETIME_FORMAT,
     FILE_MOD,
     FILE_SAVE_MESSAGE,
+    JSONL_MOD,
+    OUTPUT_FLUSH_INTERVAL,
     PRETTY_MOD,
-    RESULTS_DIR
+    RESULTS_DB,
+    RESULTS_DIR,
+    SQLITE_MOD,
 )
 
 
-def default_output(results, *args):
+def flush_periodically(rows, flush):
+    """Пропускает строки rows и время от времени вызывает flush,
+    чтобы уже выведенные строки не потерялись при сбое.
+    """
+    flushed_at = time.monotonic()
+    for row in rows:
+        yield row
+        if time.monotonic() - flushed_at >= OUTPUT_FLUSH_INTERVAL:
+            flush()
+            flushed_at = time.monotonic()
+
+
+def iter_records(results):
+    """Строки результата в виде словарей с ключами из первой строки."""
+    results = iter(results)
+    header = next(results)
     for row in results:
+        yield dict(zip(header, row))
+
+
+def default_output(results, *args):
+    for row in flush_periodically(results, sys.stdout.flush):
         print(*row)
 
 
-def pretty_output(results, *args):
+def format_table(results):
+    from prettytable import PrettyTable
+
+    results = list(results)
     table = PrettyTable()
     table.field_names = results[0]
     table.align = 'l'
     table.add_rows(results[1:])
-    print(table)
+    return table.get_string()
 
 
-def file_output(results, cli_args):
+def pretty_output(results, *args):
+    print(format_table(results))
+
+
+def get_results_path(cli_args, extension):
     results_dir = BASE_DIR / RESULTS_DIR
     results_dir.mkdir(exist_ok=True)
-    parser_mode = cli_args.mode
     now_formatted = dt.datetime.now().strftime(DATETIME_FORMAT)
-    file_path = results_dir / f'{parser_mode}_{now_formatted}.csv'
+    return results_dir / f'{cli_args.mode}_{now_formatted}.{extension}'
+
+
+def file_output(results, cli_args):
+    file_path = get_results_path(cli_args, 'csv')
     with open(file_path, 'w', encoding='utf-8') as file:
         writer = csv.writer(file, dialect=csv.unix_dialect)
-        writer.writerows(results)
+        writer.writerows(flush_periodically(results, file.flush))
     logging.info(FILE_SAVE_MESSAGE.format(path=file_path))
 
 
+def jsonl_output(results, cli_args):
+    """JSON Lines: по объекту на строку результата, ключи — заголовки."""
+    file_path = get_results_path(cli_args, 'jsonl')
+    with open(file_path, 'w', encoding='utf-8') as file:
+        for record in flush_periodically(iter_records(results), file.flush):
+            file.write(json.dumps(record, ensure_ascii=False) + '\n')
+    logging.info(FILE_SAVE_MESSAGE.format(path=file_path))
+
+
+def open_results_db(path):
+    connection = sqlite3.connect(path)
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS results ('
+        'run_at TEXT, mode TEXT, row_number INTEGER, data TEXT)'
+    )
+    connection.execute(
+        'CREATE INDEX IF NOT EXISTS results_mode ON results (mode, run_at)'
+    )
+    return connection
+
+
+def sqlite_output(results, cli_args):
+    """Добавляет строки результата в общую базу results.sqlite3.
+
+    Каждая строка хранится как JSON-объект с ключами из заголовка,
+    вместе с временем запуска и режимом, так что результаты прошлых
+    запусков можно сравнивать SQL-запросами.
+    """
+    results_dir = BASE_DIR / RESULTS_DIR
+    results_dir.mkdir(exist_ok=True)
+    db_path = results_dir / RESULTS_DB
+    run_at = dt.datetime.now().isoformat(timespec='seconds')
+    with closing(open_results_db(db_path)) as connection:
+        for row_number, record in enumerate(flush_periodically(
+            iter_records(results), connection.commit
+        )):
+            connection.execute(
+                'INSERT INTO results VALUES (?, ?, ?, ?)',
+                (
+                    run_at,
+                    cli_args.mode,
+                    row_number,
+                    json.dumps(record, ensure_ascii=False),
+                )
+            )
+        connection.commit()
+    logging.info(FILE_SAVE_MESSAGE.format(path=db_path))
+
+
 OUTPUT_FUNCTIONS = {
     FILE_MOD: file_output,
+    JSONL_MOD: jsonl_output,
+    SQLITE_MOD: sqlite_output,
     PRETTY_MOD: pretty_output,
     None: default_output,
 }
@@ -0,0 +1,40 @@
+import pickle
+import sqlite3
+
+from constants import PARSE_MEMO_VERSION
+
+
+def open_parse_memo(path):
+    connection = sqlite3.connect(path)
+    [version] = connection.execute('PRAGMA user_version').fetchone()
+    if version != PARSE_MEMO_VERSION:
+        with connection:
+            connection.execute('DROP TABLE IF EXISTS memo')
+            connection.execute(f'PRAGMA user_version = {PARSE_MEMO_VERSION}')
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS memo ('
+        'url TEXT, parser TEXT, content_hash TEXT, result BLOB, '
+        'PRIMARY KEY (url, parser))'
+    )
+    return connection
+
+
+def load_parse_memo(connection):
+    return {
+        (url, parser): (content_hash, pickle.loads(result))
+        for url, parser, content_hash, result in connection.execute(
+            'SELECT url, parser, content_hash, result FROM memo'
+        )
+    }
+
+
+def save_parse_memo(connection, memo, keys):
+    """Сохраняет записи memo с ключами keys, заменяя прежние результаты."""
+    with connection:
+        connection.executemany(
+            'INSERT OR REPLACE INTO memo VALUES (?, ?, ?, ?)',
+            (
+                (*key, memo[key][0], pickle.dumps(memo[key][1]))
+                for key in keys
+            )
+        )
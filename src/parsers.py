@@ -0,0 +1,109 @@
+from itertools import groupby
+
+from bs4 import SoupStrainer
+
+from constants import (
+    MISSING_TAG_MESSAGE,
+    PEP_INDEX_COLUMNS,
+    PEP_INDEX_NUMBER_COLUMN,
+    PYTHON_VERSION_ERROR_MESSAGE,
+)
+from exceptions import ParserFindTagException
+from utils import find_tag, make_soup
+
+# Фильтры разбора: BeautifulSoup строит дерево только для нужных тегов.
+PEP_CARD_STRAINER = SoupStrainer('dl')
+PEP_INDEX_STRAINER = SoupStrainer(id='numerical-index')
+VERSION_PAGE_STRAINER = SoupStrainer(['h1', 'dl'])
+VERSIONS_MENU_STRAINER = SoupStrainer('div', class_='menu-wrapper')
+WHATS_NEW_INDEX_STRAINER = SoupStrainer(id='what-s-new-in-python')
+
+
+def parse_pep_status(html):
+    return find_tag(
+        make_soup(html, PEP_CARD_STRAINER), 'dl'
+    ).find(
+        string='Status'
+    ).parent.find_next_sibling().text
+
+
+def parse_version_info(html):
+    soup = make_soup(html, VERSION_PAGE_STRAINER)
+    return (
+        find_tag(soup, 'h1').text,
+        find_tag(soup, 'dl').text.replace('\n', ' ')
+    )
+
+
+def get_cell_links(tables):
+    """Первая ссылка каждой ячейки таблиц: id ячейки -> href.
+    Ссылки выбираются одним find_all на таблицу, без поиска по строкам.
+    """
+    links = {}
+    for table in tables:
+        for link in table('a', href=True):
+            for parent in link.parents:
+                if parent.name == 'td':
+                    links.setdefault(id(parent), link['href'])
+                    break
+    return links
+
+
+def extract_pep_index(html, columns):
+    """Строки числового индекса за один проход по его ячейкам и ссылкам:
+    (ссылка, текст первых columns ячеек). Повторы номера PEP пропускаются.
+    """
+    tables = make_soup(html, PEP_INDEX_STRAINER).find_all('tbody')
+    cells = [cell for table in tables for cell in table('td')]
+    links = get_cell_links(tables)
+    rows = {}
+    for _, row in groupby(cells, key=lambda cell: id(cell.parent)):
+        row = list(row)
+        if len(row) < columns:
+            raise ParserFindTagException(
+                MISSING_TAG_MESSAGE.format(tag='td', attrs=None)
+            )
+        number_cell = row[PEP_INDEX_NUMBER_COLUMN]
+        if id(number_cell) not in links:
+            raise ParserFindTagException(
+                MISSING_TAG_MESSAGE.format(tag='a', attrs=None)
+            )
+        number = number_cell.text
+        if number not in rows:
+            rows[number] = (
+                links[id(number_cell)],
+                *(cell.text for cell in row[:columns])
+            )
+    return list(rows.values())
+
+
+def parse_pep_index(html):
+    return [
+        (href, code[1:])
+        for href, code, _ in extract_pep_index(
+            html, PEP_INDEX_NUMBER_COLUMN + 1
+        )
+    ]
+
+
+def parse_pep_index_records(html):
+    """Строки индекса PEP: (ссылка, тип и статус, номер, заголовок, авторы)."""
+    return extract_pep_index(html, PEP_INDEX_COLUMNS)
+
+
+def parse_whats_new_index(html):
+    return [
+        section.find('a')['href']
+        for section in make_soup(html, WHATS_NEW_INDEX_STRAINER).select(
+            '#what-s-new-in-python div.toctree-wrapper li.toctree-l1'
+        )
+    ]
+
+
+def parse_latest_versions(html):
+    for ul in make_soup(html, VERSIONS_MENU_STRAINER).select(
+        'div.menu-wrapper ul'
+    ):
+        if 'All versions' in ul.text:
+            return [(a_tag['href'], a_tag.text) for a_tag in ul.find_all('a')]
+    raise RuntimeError(PYTHON_VERSION_ERROR_MESSAGE)
@@ -0,0 +1,41 @@
+"""Выборки из записей PEP (pep_state.PepRecord) по индексам в памяти.
+
+Индекс — словарь значение поля -> позиции записей в списке, поэтому
+выборка по статусу и типу не просматривает все записи.
+"""
+from collections import Counter, defaultdict
+
+# Поля записи, по которым строятся индексы.
+INDEXED_FIELDS = ('type', 'page_status')
+
+
+def normalize(value):
+    return (value or '').casefold()
+
+
+def build_indexes(records):
+    """Поле -> значение (без учёта регистра) -> позиции записей."""
+    indexes = {field: defaultdict(list) for field in INDEXED_FIELDS}
+    for position, record in enumerate(records):
+        for field in INDEXED_FIELDS:
+            indexes[field][normalize(getattr(record, field))].append(position)
+    return indexes
+
+
+def select_records(records, indexes, **conditions):
+    """Записи, у которых поля равны conditions без учёта регистра;
+    условия со значением None не учитываются.
+    """
+    positions = None
+    for field, value in conditions.items():
+        if value is None:
+            continue
+        matched = set(indexes[field].get(normalize(value), ()))
+        positions = matched if positions is None else positions & matched
+    if positions is None:
+        return list(records)
+    return [records[position] for position in sorted(positions)]
+
+
+def count_records(records, field):
+    return Counter(getattr(record, field) for record in records)
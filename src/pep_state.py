@@ -0,0 +1,58 @@
+import sqlite3
+from collections import namedtuple
+
+PepState = namedtuple('PepState', 'index_status page_status content_hash')
+# Запись о PEP для режима pep-query: тип и статус из индекса (код),
+# статус из карточки PEP и данные строки индекса.
+PepRecord = namedtuple(
+    'PepRecord', 'number title type index_status page_status authors link'
+)
+
+
+def open_pep_state(path):
+    connection = sqlite3.connect(path)
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS peps ('
+        'link TEXT PRIMARY KEY, index_status TEXT, '
+        'page_status TEXT, content_hash TEXT)'
+    )
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS pep_records ('
+        'number INTEGER, title TEXT, type TEXT, index_status TEXT, '
+        'page_status TEXT, authors TEXT, link TEXT PRIMARY KEY)'
+    )
+    return connection
+
+
+def load_pep_state(connection):
+    return {
+        link: PepState(*row) for link, *row in connection.execute(
+            'SELECT link, index_status, page_status, content_hash FROM peps'
+        )
+    }
+
+
+def save_pep_state(connection, state):
+    with connection:
+        connection.execute('DELETE FROM peps')
+        connection.executemany(
+            'INSERT INTO peps VALUES (?, ?, ?, ?)',
+            ((link, *pep) for link, pep in state.items())
+        )
+
+
+def load_pep_records(connection):
+    return [
+        PepRecord(*row) for row in connection.execute(
+            'SELECT number, title, type, index_status, page_status, '
+            'authors, link FROM pep_records ORDER BY number'
+        )
+    ]
+
+
+def save_pep_records(connection, records):
+    with connection:
+        connection.execute('DELETE FROM pep_records')
+        connection.executemany(
+            'INSERT INTO pep_records VALUES (?, ?, ?, ?, ?, ?, ?)', records
+        )
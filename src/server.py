@@ -0,0 +1,109 @@
+"""HTTP API режима serve: результаты режимов в JSON прямо из памяти.
+
+GET /         — список режимов и время последнего обновления;
+GET /<режим>  — записи результата режима, ключи — заголовки таблицы;
+                ?q=<текст> оставляет записи, в которых встречается текст.
+"""
+import datetime as dt
+import json
+import logging
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from constants import (
+    MODE_NOT_READY_MESSAGE,
+    REFRESH_ERROR_MESSAGE,
+    UNKNOWN_MODE_MESSAGE,
+)
+from outputs import iter_records
+
+
+def set_results(results, mode, rows):
+    """Заменяет результат режима целиком, чтобы обработчики запросов
+    в других потоках видели либо прежний, либо новый результат.
+    """
+    results[mode] = {
+        'mode': mode,
+        'updated_at': dt.datetime.now().isoformat(timespec='seconds'),
+        'results': list(iter_records(rows)),
+    }
+
+
+def get_index(results):
+    return {'modes': {
+        mode: {
+            'url': f'/{mode}',
+            'updated_at': None if answer is None else answer['updated_at'],
+        }
+        for mode, answer in list(results.items())
+    }}
+
+
+def filter_records(records, query):
+    query = query.casefold()
+    return [
+        record for record in records
+        if any(query in str(value).casefold() for value in record.values())
+    ]
+
+
+def route(results, path, query=''):
+    """HTTP-статус и тело ответа на GET-запрос path."""
+    mode = path.strip('/')
+    if not mode:
+        return HTTPStatus.OK, get_index(results)
+    if mode not in results:
+        return HTTPStatus.NOT_FOUND, {
+            'error': UNKNOWN_MODE_MESSAGE.format(mode=mode)
+        }
+    answer = results[mode]
+    if answer is None:
+        return HTTPStatus.SERVICE_UNAVAILABLE, {
+            'error': MODE_NOT_READY_MESSAGE.format(mode=mode)
+        }
+    if query:
+        answer = {
+            **answer, 'results': filter_records(answer['results'], query)
+        }
+    return HTTPStatus.OK, answer
+
+
+def create_handler(results):
+    class ResultsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlsplit(self.path)
+            status, body = route(
+                results, url.path, parse_qs(url.query).get('q', [''])[0]
+            )
+            data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            logging.debug(format, *args)
+
+    return ResultsHandler
+
+
+def create_server(address, results):
+    """Сервер отвечает на запросы в потоках; results — словарь
+    режим -> ответ (set_results) или None, пока режим не выполнен.
+    """
+    return ThreadingHTTPServer(address, create_handler(results))
+
+
+def refresh_periodically(refresh, interval, stop):
+    """Вызывает refresh сразу и затем раз в interval секунд,
+    пока не установлено событие stop.
+    """
+    while True:
+        try:
+            refresh()
+        except Exception as error:
+            logging.exception(REFRESH_ERROR_MESSAGE.format(error=error))
+        if stop.wait(interval):
+            return
@@ -0,0 +1,121 @@
+import zlib
+from functools import partial
+
+import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from constants import (
+    CACHE_COMPRESSION_LEVEL,
+    DEFAULT_BURST,
+    DEFAULT_EXPIRE_AFTER,
+    DEFAULT_RETRIES,
+    DEFAULT_TIMEOUT,
+    DEFAULT_WORKERS,
+    SQLITE_BACKEND,
+    RETRY_BACKOFF_FACTOR,
+    RETRY_STATUSES,
+    URLS_EXPIRE_AFTER,
+)
+from throttling import HostRateLimiter
+
+# Ответ сериализуется pickle и сжимается zlib: HTML-страницы занимают
+# в кеше в несколько раз меньше места, а распаковка при чтении прозрачна.
+compressed_serializer = requests_cache.SerializerPipeline(
+    [
+        *requests_cache.pickle_serializer.stages,
+        requests_cache.Stage(
+            dumps=partial(zlib.compress, level=CACHE_COMPRESSION_LEVEL),
+            loads=zlib.decompress,
+        ),
+    ],
+    name='pickle_zlib',
+    is_binary=True,
+)
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter с таймаутом по умолчанию для всех запросов.
+
+    Если задан rate_limiter (HostRateLimiter), запрос ждёт своей очереди
+    к хосту. CachedSession обращается к адаптеру только при промахах
+    и перепроверках кеша, поэтому ответы из кеша ограничитель не тратят.
+    """
+
+    def __init__(
+        self, *args, timeout=DEFAULT_TIMEOUT, rate_limiter=None, **kwargs
+    ):
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        if self.rate_limiter is not None:
+            self.rate_limiter.wait(request.url)
+        return super().send(
+            request,
+            timeout=self.timeout if timeout is None else timeout,
+            **kwargs
+        )
+
+
+def get_urls_expire_after(rules):
+    """Правила из командной строки проверяются раньше правил по умолчанию."""
+    urls_expire_after = dict(rules)
+    for pattern, seconds in URLS_EXPIRE_AFTER.items():
+        urls_expire_after.setdefault(pattern, seconds)
+    return urls_expire_after
+
+
+def create_adapter(cli_args=None, rate_limiter=None):
+    return TimeoutHTTPAdapter(
+        pool_maxsize=getattr(cli_args, 'workers', DEFAULT_WORKERS),
+        max_retries=Retry(
+            total=getattr(cli_args, 'retries', DEFAULT_RETRIES),
+            backoff_factor=RETRY_BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=('GET', 'HEAD'),
+            # Ответы 429 и 503 повторяет utils.send_request, приостанавливая
+            # запросы к хосту во всех потоках; urllib3 ждал бы Retry-After
+            # только в своём потоке и повторял запрос ещё раз.
+            respect_retry_after_header=False,
+        ),
+        timeout=getattr(cli_args, 'timeout', DEFAULT_TIMEOUT),
+        rate_limiter=rate_limiter,
+    )
+
+
+def create_session(cli_args=None):
+    """CachedSession со сжатием ответов в кеше, пулом соединений под
+    число потоков, повторами запросов при временных ошибках, таймаутом
+    и ограничителем частоты запросов к каждому хосту (атрибут rate_limiter).
+    """
+    session = requests_cache.CachedSession(
+        backend=getattr(cli_args, 'cache_backend', SQLITE_BACKEND),
+        serializer=compressed_serializer,
+        expire_after=DEFAULT_EXPIRE_AFTER,
+        urls_expire_after=get_urls_expire_after(
+            getattr(cli_args, 'expire', [])
+        ),
+    )
+    session.rate_limiter = HostRateLimiter(
+        rate=getattr(cli_args, 'rate', None),
+        burst=getattr(cli_args, 'burst', DEFAULT_BURST),
+        retries=getattr(cli_args, 'retries', DEFAULT_RETRIES),
+    )
+    adapter = create_adapter(cli_args, session.rate_limiter)
+    for prefix in ('http://', 'https://'):
+        session.mount(prefix, adapter)
+    return session
+
+
+def get_connection_stats(session):
+    """Возвращает число отправленных запросов и открытых соединений."""
+    requests_count = connections_count = 0
+    for adapter in set(session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools[key]
+            requests_count += pool.num_requests
+            connections_count += pool.num_connections
+    return requests_count, connections_count
@@ -0,0 +1,84 @@
+import time
+from threading import Lock
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    """Ограничитель скорости «ведро токенов».
+
+    Токены пополняются со скоростью rate в секунду, но не больше capacity.
+    consume(amount) блокирует поток, пока в ведре не наберётся amount
+    токенов; reserve(amount) забирает токены сразу и возвращает, сколько
+    секунд нужно подождать, не блокируя поток (для корутин). Объект можно
+    использовать из нескольких потоков.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = rate if capacity is None else capacity
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = Lock()
+
+    def reserve(self, amount=1):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity,
+                self.tokens + (now - self.updated_at) * self.rate
+            )
+            self.updated_at = now
+            self.tokens -= amount
+            return max(0, -self.tokens / self.rate)
+
+    def consume(self, amount=1):
+        delay = self.reserve(amount)
+        if delay > 0:
+            time.sleep(delay)
+
+
+class HostRateLimiter:
+    """Ограничивает частоту запросов отдельно для каждого хоста.
+
+    Для каждого хоста создаётся своё ведро токенов (rate запросов в
+    секунду, запас burst). Если rate не задан, частота не ограничивается,
+    но паузы, назначенные через pause (например, по Retry-After),
+    соблюдаются всеми потоками.
+    """
+
+    def __init__(self, rate=None, burst=1, retries=0):
+        self.rate = rate
+        self.burst = burst
+        self.retries = retries
+        self.buckets = {}
+        self.paused_until = {}
+        self.lock = Lock()
+
+    def get_bucket(self, host):
+        with self.lock:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(self.rate, self.burst)
+            return self.buckets[host]
+
+    def reserve(self, url):
+        """Занимает место в очереди запросов к хосту и возвращает, сколько
+        секунд ждать перед запросом. Пока идёт пауза, ведро пополняется.
+        """
+        host = urlsplit(url).netloc
+        with self.lock:
+            delay = self.paused_until.get(host, 0) - time.monotonic()
+        if self.rate is not None:
+            delay = max(delay, self.get_bucket(host).reserve())
+        return max(0, delay)
+
+    def wait(self, url):
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, url, seconds):
+        host = urlsplit(url).netloc
+        with self.lock:
+            self.paused_until[host] = max(
+                self.paused_until.get(host, 0), time.monotonic() + seconds
+            )
@@ -0,0 +1,108 @@
+import math
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from threading import Lock, local
+
+from constants import (
+    HEADERS_TIMINGS_TABLE,
+    STAGE_FETCH_CACHE,
+    STAGE_FETCH_NETWORK,
+)
+
+# Этап -> список длительностей, сек.
+stage_timings = defaultdict(list)
+stage_timings_lock = Lock()
+# Стек вложенных замеров текущего потока: сколько времени ушло
+# на вложенные этапы, чтобы у внешнего этапа учитывалось только своё.
+measurements = local()
+
+
+def record_timing(stage, seconds):
+    with stage_timings_lock:
+        stage_timings[stage].append(seconds)
+
+
+def reset_timings():
+    """Забирает накопленные замеры и очищает их, чтобы в долгой работе
+    (режим serve) замеры не копились без конца.
+    """
+    with stage_timings_lock:
+        timings = dict(stage_timings)
+        stage_timings.clear()
+    return timings
+
+
+def get_fetch_stage(from_cache):
+    return STAGE_FETCH_CACHE if from_cache else STAGE_FETCH_NETWORK
+
+
+@contextmanager
+def measure(spent):
+    """Добавляет в spent собственное время блока, без вложенных замеров."""
+    stack = measurements.__dict__.setdefault('stack', [])
+    stack.append(0.0)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        nested = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        spent.append(elapsed - nested)
+
+
+@contextmanager
+def timed(stage):
+    spent = []
+    try:
+        with measure(spent):
+            yield
+    finally:
+        record_timing(stage, spent[0])
+
+
+def timed_rows(stage, rows):
+    """Пропускает строки rows и учитывает время их получения
+    как один вызов этапа stage.
+    """
+    spent = []
+    rows = iter(rows)
+    while True:
+        with measure(spent):
+            row = next(rows, None)
+        if row is None:
+            break
+        yield row
+    record_timing(stage, sum(spent))
+
+
+def percentile(values, fraction):
+    """Перцентиль по методу ближайшего ранга; values отсортированы."""
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+
+def summarize_timings(timings=None):
+    """Таблица: этап, число вызовов, суммарное время, p50, p95 и максимум."""
+    if timings is None:
+        with stage_timings_lock:
+            timings = {
+                stage: list(values) for stage, values in stage_timings.items()
+            }
+    results = [HEADERS_TIMINGS_TABLE]
+    for stage, values in timings.items():
+        values = sorted(values)
+        results.append((
+            stage,
+            len(values),
+            *(
+                round(seconds * 1000, 1) for seconds in (
+                    sum(values),
+                    percentile(values, 0.5),
+                    percentile(values, 0.95),
+                    values[-1],
+                )
+            ),
+        ))
+    return results
@@ -1,16 +1,134 @@
+import hashlib
 import logging
-from requests import RequestException
+import multiprocessing
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from collections import Counter
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from contextlib import nullcontext
+from functools import partial
+from threading import Lock
 
-from bs4 import BeautifulSoup
+from requests import Request, RequestException, Session
 
-from constants import PAGE_LOADING_ERROR_MESSAGE, MISSING_TAG_MESSAGE
+from constants import (
+    CACHE_HIT,
+    CACHE_MISS,
+    CACHE_REVALIDATED,
+    DEFAULT_WORKERS,
+    DOWNLOAD_CHUNK_SIZE,
+    ETAG_SUFFIX,
+    MISSING_TAG_MESSAGE,
+    PAGE_LOADING_ERROR_MESSAGE,
+    PART_SUFFIX,
+    RETRY_AFTER_STATUSES,
+    RETRY_BACKOFF_FACTOR,
+    STAGE_EXTRACT,
+    STAGE_PARSE,
+)
 from exceptions import ParserFindTagException
+from timing import get_fetch_stage, measure, record_timing, timed
 
+cache_stats = Counter()
+# Ключ записи кеша -> (число попаданий, время последнего обращения).
+# Сохраняется в конце работы и используется режимом cache для LRU.
+cache_usage = {}
+cache_stats_lock = Lock()
+# (URL, парсер) -> (хеш страницы, результат разбора). Пока страница
+# в кеше не изменилась, её не нужно разбирать заново.
+parse_memo = {}
+parse_memo_changed = set()
 
-def get_response(session, url):
+
+def record_cache_usage(*keys, cache_key=None):
+    with cache_stats_lock:
+        cache_stats.update(keys)
+        if cache_key is not None:
+            hits, _ = cache_usage.get(cache_key, (0, None))
+            cache_usage[cache_key] = (hits + (CACHE_HIT in keys), time.time())
+
+
+def get_cache_status(response):
+    """CACHE_HIT, CACHE_REVALIDATED (ответ 304) или CACHE_MISS."""
+    if not getattr(response, 'from_cache', False):
+        return CACHE_MISS
+    if getattr(response, 'revalidated', False):
+        return CACHE_REVALIDATED
+    return CACHE_HIT
+
+
+def count_cache_usage(response):
+    cache_key = getattr(response, 'cache_key', None)
+    cache_status = get_cache_status(response)
+    if cache_status == CACHE_REVALIDATED:
+        record_cache_usage(
+            CACHE_HIT, CACHE_REVALIDATED, cache_key=cache_key
+        )
+    else:
+        record_cache_usage(cache_status, cache_key=cache_key)
+
+
+def get_retry_delay(status, retry_after, attempt):
+    """Пауза перед повтором запроса, сек, по коду ответа и значению
+    заголовка Retry-After, или None, если повтор не нужен.
+    """
+    if status not in RETRY_AFTER_STATUSES:
+        return None
+    if retry_after is None:
+        return RETRY_BACKOFF_FACTOR * 2 ** attempt
+    if retry_after.isdigit():
+        return int(retry_after)
     try:
+        return max(
+            0, (parsedate_to_datetime(retry_after) - datetime.now(
+                timezone.utc
+            )).total_seconds()
+        )
+    except (TypeError, ValueError):
+        return RETRY_BACKOFF_FACTOR * 2 ** attempt
+
+
+def get_retry_after(response, attempt):
+    return get_retry_delay(
+        response.status_code, response.headers.get('Retry-After'), attempt
+    )
+
+
+def send_request(session, url):
+    """GET-запрос с учётом ограничителя частоты сессии (rate_limiter).
+
+    Очереди к хосту ждёт адаптер сессии (sessions.TimeoutHTTPAdapter),
+    то есть только запросы, которые не обслужил кеш. Ответ 429/503
+    приостанавливает запросы к хосту во всех потоках на время
+    из Retry-After, после чего запрос повторяется.
+    """
+    rate_limiter = getattr(session, 'rate_limiter', None)
+    if rate_limiter is None:
+        return session.get(url)
+    for attempt in range(rate_limiter.retries + 1):
         response = session.get(url)
+        delay = get_retry_after(response, attempt)
+        if delay is None:
+            break
+        rate_limiter.pause(url, delay)
+    return response
+
+
+def get_response(session, url):
+    spent = []
+    try:
+        with measure(spent):
+            response = send_request(session, url)
         response.encoding = 'utf-8'
+        count_cache_usage(response)
+        record_timing(
+            get_fetch_stage(getattr(response, 'from_cache', False)), *spent
+        )
         return response
     except RequestException:
         raise ConnectionError(logging.exception(
@@ -19,8 +137,17 @@ def get_response(session, url):
         ))
 
 
-def get_soup(session, *args):
-    return BeautifulSoup(get_response(session, *args).text, features='lxml')
+def make_soup(html, parse_only=None):
+    # bs4 загружается при первом разборе: движку lxml и режимам
+    # без разбора страниц он не нужен.
+    from bs4 import BeautifulSoup
+
+    with timed(STAGE_PARSE):
+        return BeautifulSoup(html, features='lxml', parse_only=parse_only)
+
+
+def get_soup(session, url, parse_only=None):
+    return make_soup(get_response(session, url).text, parse_only)
 
 
 def find_tag(soup, tag, attrs=None):
@@ -30,3 +157,286 @@ def find_tag(soup, tag, attrs=None):
             MISSING_TAG_MESSAGE.format(tag=tag, attrs=attrs)
         )
     return searched_tag
+
+
+def progress_bar(iterable=None, **kwargs):
+    """Индикатор прогресса tqdm; tqdm загружается при первом вызове."""
+    from tqdm import tqdm
+
+    return tqdm(iterable, **kwargs)
+
+
+def run_concurrently(function, items, workers=DEFAULT_WORKERS):
+    """Выполняет function для каждого элемента items в пуле потоков.
+
+    Futures возвращаются в порядке items, а не в порядке завершения,
+    поэтому обработка результатов остаётся детерминированной.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        yield from [executor.submit(function, item) for item in items]
+
+
+def get_cache_key(session, url):
+    return session.cache.create_key(Request('GET', url).prepare())
+
+
+def get_cached_response(session, url):
+    return session.cache.get_response(get_cache_key(session, url))
+
+
+def is_cache_fresh(session, url):
+    cached_response = get_cached_response(session, url)
+    return cached_response is not None and not cached_response.is_expired
+
+
+def hash_content(html):
+    return hashlib.sha1(html.encode('utf-8')).hexdigest()
+
+
+def completed_future(result):
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+def then(future, function):
+    """Future результата function(результат future), без ожидания
+    в текущем потоке: function вызывается, когда future завершится.
+    """
+    chained = Future()
+
+    def on_done(done):
+        try:
+            chained.set_result(function(done.result()))
+        except BaseException as error:
+            chained.set_exception(error)
+
+    future.add_done_callback(on_done)
+    return chained
+
+
+def flatten(future):
+    """Future, результат которого — другой Future, превращается в Future
+    с результатом вложенного.
+    """
+    flat = Future()
+
+    def on_inner_done(inner):
+        try:
+            flat.set_result(inner.result())
+        except BaseException as error:
+            flat.set_exception(error)
+
+    def on_done(done):
+        try:
+            done.result().add_done_callback(on_inner_done)
+        except BaseException as error:
+            flat.set_exception(error)
+
+    future.add_done_callback(on_done)
+    return flat
+
+
+def submit_parse(html, parser, parse_pool=None):
+    """Future результата разбора. Без пула страница разбирается сразу
+    в текущем потоке; с пулом поток не ждёт разбора, а время от передачи
+    страницы в пул до результата учитывается как этап разбора: замеры
+    внутри дочерних процессов в сводку не попадают.
+    """
+    if parse_pool is None:
+        with timed(STAGE_EXTRACT):
+            return completed_future(parser(html))
+    start = time.perf_counter()
+    future = parse_pool.submit(parser, html)
+    future.add_done_callback(lambda _: record_timing(
+        STAGE_PARSE, time.perf_counter() - start
+    ))
+    return future
+
+
+def get_parser_name(parser):
+    """Имя парсера для parse_memo или None для объектов без имени модуля."""
+    module = getattr(parser, '__module__', None)
+    qualname = getattr(parser, '__qualname__', None)
+    if module is None or qualname is None:
+        return None
+    return f'{module}.{qualname}'
+
+
+def remember_parse(memo_key, content_hash, result):
+    parse_memo[memo_key] = (content_hash, result)
+    parse_memo_changed.add(memo_key)
+    return result
+
+
+def parse_page_html(url, html, parser, parse_pool=None):
+    """Future результата разбора страницы. Результат берётся
+    из parse_memo, если страница с таким содержимым уже разбиралась
+    этим парсером.
+    """
+    parser_name = get_parser_name(parser)
+    if parser_name is None:
+        return submit_parse(html, parser, parse_pool)
+    memo_key = (url, parser_name)
+    content_hash = hash_content(html)
+    memoized = parse_memo.get(memo_key)
+    if memoized is not None and memoized[0] == content_hash:
+        return completed_future(memoized[1])
+    return then(
+        submit_parse(html, parser, parse_pool),
+        partial(remember_parse, memo_key, content_hash)
+    )
+
+
+def parse_changed_page(known_hashes, url, html, parser, parse_pool=None):
+    """Future пары (результат разбора, хеш страницы).
+
+    Если хеш совпадает с известным, страница не разбирается
+    и вместо результата возвращается None.
+    """
+    content_hash = hash_content(html)
+    if known_hashes.get(url) == content_hash:
+        return completed_future((None, content_hash))
+    return then(
+        submit_parse(html, parser, parse_pool),
+        lambda result: (result, content_hash)
+    )
+
+
+def parse_page(
+        session, url, parser, parse_pool=None, page_parser=parse_page_html
+):
+    return page_parser(
+        url, get_response(session, url).text, parser, parse_pool
+    )
+
+
+def get_parse_pool_context():
+    """Процессы разбора запускаются не через fork: пул создаёт их из
+    потока загрузки, пока другие потоки могут держать блокировки
+    (логирование, замеры timing, SQLite кеша). Дочерний процесс
+    унаследовал бы занятую блокировку и завис на ней.
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+def open_parse_pool(cli_args=None):
+    """Пул процессов разбора на весь запуск (атрибут parse_pool сессии)
+    или nullcontext, если `--parse-processes` не задан.
+    """
+    processes = getattr(cli_args, 'parse_processes', None)
+    if not processes:
+        return nullcontext()
+    return ProcessPoolExecutor(
+        max_workers=processes, mp_context=get_parse_pool_context()
+    )
+
+
+def load_pages(
+        session, urls, parser, cli_args=None, page_parser=parse_page_html
+):
+    """Загружает страницы в потоках и разбирает их функцией parser.
+
+    Если у сессии есть пул процессов разбора (parse_pool), потоки только
+    скачивают HTML и передают его в пул, не дожидаясь разбора, так что
+    сеть и разбор идут параллельно. page_parser вызывается для каждой
+    страницы как page_parser(url, html, parser, parse_pool) и возвращает
+    Future результата.
+    """
+    yield from map(flatten, run_concurrently(
+        partial(
+            parse_page,
+            session,
+            parser=parser,
+            parse_pool=getattr(session, 'parse_pool', None),
+            page_parser=page_parser
+        ),
+        urls,
+        getattr(cli_args, 'workers', DEFAULT_WORKERS)
+    ))
+
+
+def get_uncached_session(session):
+    """Сессия без кеша, которая использует адаптеры и пул соединений session.
+
+    Такую сессию нельзя закрывать: это закроет адаптеры исходной сессии.
+    """
+    uncached_session = Session()
+    uncached_session.adapters = session.adapters
+    uncached_session.headers = session.headers
+    return uncached_session
+
+
+def get_remote_file_info(session, url):
+    response = session.head(url, allow_redirects=True)
+    response.raise_for_status()
+    size = response.headers.get('Content-Length')
+    return (int(size) if size else None), response.headers.get('ETag')
+
+
+def get_resume_offset(part_path, etag, known_etag):
+    """Докачка возможна, только если сильный ETag не изменился."""
+    if (
+        not part_path.exists()
+        or etag is None
+        or etag.startswith('W/')
+        or etag != known_etag
+    ):
+        return 0
+    return part_path.stat().st_size
+
+
+def stream_to_file(response, file, progress, limiter=None):
+    for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+        if limiter is not None:
+            limiter.consume(len(chunk))
+        file.write(chunk)
+        progress.update(len(chunk))
+
+
+def download_file(session, url, path, limiter=None, position=None):
+    """Потоково скачивает файл в обход кеша.
+
+    Данные пишутся во временный файл `.part`, который после загрузки
+    атомарно переименовывается. Недокачанный файл докачивается запросом
+    Range. Возвращает False, если локальный файл совпадает с удалённым
+    по размеру и ETag и загрузка не понадобилась.
+    limiter (TokenBucket) ограничивает скорость в байтах в секунду,
+    position задаёт строку индикатора прогресса при параллельных загрузках.
+    """
+    session = get_uncached_session(session)
+    size, etag = get_remote_file_info(session, url)
+    etag_path = path.with_name(path.name + ETAG_SUFFIX)
+    known_etag = etag_path.read_text() if etag_path.exists() else None
+    if (
+        path.exists() and path.stat().st_size == size and etag == known_etag
+    ):
+        return False
+    part_path = path.with_name(path.name + PART_SUFFIX)
+    offset = get_resume_offset(part_path, etag, known_etag)
+    if size is not None and offset > size:
+        # Файл `.part` больше удалённого — это не недокачанный архив,
+        # его нельзя ни докачать, ни переименовать: качаем заново.
+        part_path.unlink()
+        offset = 0
+    if size is not None and offset == size:
+        part_path.replace(path)
+        return True
+    if etag is None:
+        etag_path.unlink(missing_ok=True)
+    else:
+        etag_path.write_text(etag)
+    headers = {'Range': f'bytes={offset}-', 'If-Range': etag} if offset else {}
+    with session.get(url, stream=True, headers=headers) as response:
+        response.raise_for_status()
+        if response.status_code != 206:
+            offset = 0
+        with open(part_path, 'ab' if offset else 'wb') as file, progress_bar(
+            total=size, initial=offset, unit='B', unit_scale=True,
+            unit_divisor=1024, desc=path.name, position=position
+        ) as progress:
+            stream_to_file(response, file, progress, limiter)
+    part_path.replace(path)
+    return True
@@ -1,5 +1,8 @@
 import pytest
 import sys
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from bs4 import BeautifulSoup
 import requests_mock
@@ -87,6 +90,48 @@ def soup(response_page):
     return BeautifulSoup(response, features='lxml')
 
 
+@pytest.fixture
+def local_server():
+    """Запускает локальный HTTP-сервер, чтобы запросы проходили через
+    настоящий адаптер: routes — путь -> функция, которая по номеру
+    запроса к пути возвращает (код, заголовки). Возвращает адрес сервера
+    и счётчик запросов по путям.
+    """
+    servers = []
+
+    def serve(routes):
+        requests_count = Counter()
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                requests_count[self.path] += 1
+                status, headers = routes[self.path](
+                    requests_count[self.path]
+                )
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', '2')
+                self.end_headers()
+                self.wfile.write(b'ok')
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return (
+            'http://127.0.0.1:{}'.format(server.server_address[1]),
+            requests_count
+        )
+
+    yield serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
 @pytest.fixture
 def pep_namespace():
     return Namespace(mode='pep', clear_cache=False, output='file')
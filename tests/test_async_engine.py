@@ -0,0 +1,98 @@
+from argparse import Namespace
+
+import pytest
+try:
+    from src import async_engine, throttling
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `async_engine.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `async_engine.py`'
+
+PAGE_URL = 'https://peps.python.org/pep-0008/'
+
+
+def test_store_response_is_readable_by_cached_session(tempfile_session):
+    async_engine.store_response(
+        tempfile_session, PAGE_URL, 200,
+        {'ETag': '"v1"', 'Content-Encoding': 'gzip'}, b'<h1>PEP 8</h1>'
+    )
+    response = tempfile_session.get(PAGE_URL)
+    assert response.from_cache, (
+        'Ответы асинхронного движка должны сохраняться в кеш requests-cache'
+    )
+    assert response.text == '<h1>PEP 8</h1>'
+    assert 'Content-Encoding' not in response.headers
+
+
+def test_load_pages_from_cache(tempfile_session):
+    async_engine.store_response(
+        tempfile_session, PAGE_URL, 200, {}, b'<h1>PEP 8</h1>'
+    )
+    [page] = async_engine.load_pages(
+        tempfile_session, [PAGE_URL], str.upper
+    )
+    assert page.result() == '<H1>PEP 8</H1>', (
+        'Функция `load_pages` должна брать свежие страницы из кеша '
+        'и разбирать их функцией parser'
+    )
+
+
+def test_get_validation_headers(tempfile_session):
+    async_engine.store_response(
+        tempfile_session, PAGE_URL, 200,
+        {'ETag': '"v1"', 'Last-Modified': 'Wed, 09 Nov 2022 10:00:00 GMT'},
+        b''
+    )
+    cached_response = tempfile_session.get(PAGE_URL)
+    assert async_engine.get_validation_headers(cached_response) == {
+        'If-None-Match': '"v1"',
+        'If-Modified-Since': 'Wed, 09 Nov 2022 10:00:00 GMT',
+    }
+    assert async_engine.get_validation_headers(None) == {}
+
+
+def test_load_pages_retries_like_sync_session(
+        monkeypatch, tempfile_session, local_server
+):
+    monkeypatch.setattr(async_engine, 'RETRY_BACKOFF_FACTOR', 0)
+    base_url, requests_count = local_server({
+        '/flaky': lambda count: (500 if count <= 2 else 200, {}),
+        '/broken': lambda count: (500, {}),
+        '/missing': lambda count: (404, {}),
+    })
+    pages = list(async_engine.load_pages(
+        tempfile_session,
+        [base_url + path for path in ('/flaky', '/broken', '/missing')],
+        str.upper,
+        Namespace(retries=2),
+    ))
+    assert pages[0].result() == 'OK', (
+        'Ответы 500, 502 и 504 нужно повторять до `--retries` раз'
+    )
+    assert requests_count == {'/flaky': 3, '/broken': 3, '/missing': 1}
+    for page in pages[1:]:
+        with pytest.raises(ConnectionError):
+            page.result()
+
+
+def test_load_pages_pauses_host_on_retry_after(
+        tempfile_session, local_server
+):
+    base_url, requests_count = local_server({
+        '/limited': lambda count: (
+            (429, {'Retry-After': '0'}) if count <= 2 else (200, {})
+        ),
+    })
+    tempfile_session.rate_limiter = throttling.HostRateLimiter(retries=2)
+    [page] = async_engine.load_pages(
+        tempfile_session, [base_url + '/limited'], str.upper,
+        Namespace(retries=2)
+    )
+    assert page.result() == 'OK'
+    assert requests_count == {'/limited': 3}, (
+        'Ответы 429 и 503 нужно повторять до `--retries` раз'
+    )
+    assert tempfile_session.rate_limiter.paused_until, (
+        'Ответ 429 с Retry-After должен приостанавливать запросы к хосту '
+        'через ограничитель частоты сессии'
+    )
@@ -0,0 +1,94 @@
+import time
+
+import requests_cache
+try:
+    from src import cache_maintenance, sessions
+except ModuleNotFoundError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файл `cache_maintenance.py`'
+    )
+except ImportError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файл `cache_maintenance.py`'
+    )
+
+URLS = [f'https://peps.python.org/pep-{number:04}/' for number in range(3)]
+
+
+def fill_cache(requests_mock, **kwargs):
+    session = requests_cache.CachedSession(**{'backend': 'memory', **kwargs})
+    for url in URLS:
+        requests_mock.get(url, text='x' * 1000)
+        session.get(url)
+    return session, {
+        response.url: response.cache_key
+        for response in cache_maintenance.get_cache_entries(session)
+    }
+
+
+def test_cache_usage_roundtrip(tmp_path):
+    connection = cache_maintenance.open_cache_usage(
+        tmp_path / 'usage.sqlite3'
+    )
+    cache_maintenance.save_cache_usage(connection, {'a': (1, 10.0)})
+    cache_maintenance.save_cache_usage(
+        connection, {'a': (2, 20.0), 'b': (0, 5.0)}
+    )
+    assert cache_maintenance.load_cache_usage(connection) == {
+        'a': (3, 20.0), 'b': (0, 5.0)
+    }, 'Попадания в кеш должны суммироваться между запусками'
+    cache_maintenance.forget_cache_usage(connection, ['a'])
+    assert cache_maintenance.load_cache_usage(connection) == {'b': (0, 5.0)}
+    connection.close()
+
+
+def test_evict_cache_lru(requests_mock):
+    session, keys = fill_cache(requests_mock)
+    now = time.time()
+    usage = {
+        keys[URLS[0]]: (5, now),
+        keys[URLS[1]]: (1, now - 100),
+        keys[URLS[2]]: (3, now - 10),
+    }
+    size = next(iter(session.cache.responses.values())).size
+    evicted = cache_maintenance.evict_cache(
+        session, usage, max_size=2 * size
+    )
+    assert evicted == {keys[URLS[1]]}, (
+        'Сверх лимита размера должны удаляться давно использованные записи'
+    )
+    assert len(cache_maintenance.get_cache_entries(session)) == 2
+
+
+def test_evict_cache_ttl(requests_mock):
+    session, keys = fill_cache(requests_mock)
+    assert cache_maintenance.evict_cache(session, {}, ttl=3600) == set(), (
+        'Свежие записи не должны удаляться по сроку хранения'
+    )
+    time.sleep(1.1)
+    assert cache_maintenance.evict_cache(session, {}, ttl=1) == set(
+        keys.values()
+    ), 'Записи старше срока хранения должны удаляться'
+
+
+def test_evict_cache_counts_compressed_size(requests_mock, tmp_path):
+    session, keys = fill_cache(
+        requests_mock,
+        cache_name=str(tmp_path / 'http_cache'),
+        backend='sqlite',
+        serializer=sessions.compressed_serializer,
+    )
+    responses = cache_maintenance.get_cache_entries(session)
+    stored_size = sum(
+        cache_maintenance.get_stored_size(session.cache.responses, response)
+        for response in responses
+    )
+    assert stored_size < sum(response.size for response in responses), (
+        'Размер записи должен считаться по сжатому ответу в хранилище'
+    )
+    assert cache_maintenance.evict_cache(
+        session, {}, max_size=stored_size
+    ) == set(), (
+        'Лимит `--cache-max-size` относится к сжатым записям, '
+        'а не к распакованным ответам'
+    )
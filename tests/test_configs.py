@@ -29,9 +29,86 @@ def test_configs_file():
     ),
     (
         argparse._StoreAction, ['-o', '--output'], 'output',
-        ('pretty', 'file'),
+        ('pretty', 'file', 'jsonl', 'sqlite'),
         'Дополнительные способы вывода данных'
     ),
+    (
+        argparse._StoreAction, ['-w', '--workers'], 'workers',
+        None, 'Количество потоков для загрузки страниц'
+    ),
+    (
+        argparse._StoreAction, ['-p', '--parse-processes'], 'parse_processes',
+        None, 'Количество процессов для разбора загруженных страниц'
+    ),
+    (
+        argparse._StoreAction, ['-e', '--engine'], 'engine',
+        ('bs4', 'lxml'), 'Библиотека для разбора страниц'
+    ),
+    (
+        argparse._AppendAction, ['--expire'], 'expire', None,
+        'Срок хранения в кеше страниц, адрес которых подходит под шаблон'
+    ),
+    (
+        argparse._StoreTrueAction, ['--full'], 'full', None,
+        'Проверить все PEP заново, не используя сохранённое состояние'
+    ),
+    (
+        argparse._StoreAction, ['--formats'], 'formats', None,
+        'Форматы архивов документации для загрузки'
+    ),
+    (
+        argparse._StoreAction, ['--max-bandwidth'], 'max_bandwidth', None,
+        'Общее ограничение скорости загрузки архивов, КиБ/с'
+    ),
+    (
+        argparse._StoreAction, ['--retries'], 'retries', None,
+        'Количество повторов запроса при временных ошибках сервера'
+    ),
+    (
+        argparse._StoreAction, ['--timeout'], 'timeout', None,
+        'Таймаут HTTP-запроса, сек'
+    ),
+    (
+        argparse._StoreAction, ['--rate'], 'rate', None,
+        'Ограничение частоты запросов к одному хосту, запросов в секунду'
+    ),
+    (
+        argparse._StoreAction, ['--burst'], 'burst', None,
+        'Сколько запросов к хосту можно отправить подряд без ожидания'
+    ),
+    (
+        argparse._StoreAction, ['--cache-backend'], 'cache_backend',
+        ('sqlite', 'filesystem', 'memory'), 'Хранилище кеша HTTP-ответов'
+    ),
+    (
+        argparse._StoreAction, ['--cache-ttl'], 'cache_ttl', None,
+        'Режим cache: удалить записи кеша старше указанного срока'
+    ),
+    (
+        argparse._StoreTrueAction, ['--profile'], 'profile', None,
+        'Сохранить профиль cProfile в директорию logs'
+    ),
+    (
+        argparse._StoreAction, ['--type'], 'pep_type', None,
+        'Режим pep-query: тип PEP, например "Standards Track"'
+    ),
+    (
+        argparse._StoreAction, ['--count-by'], 'count_by',
+        ('status', 'type'),
+        'Режим pep-query: вывести количество PEP по статусам или типам'
+    ),
+    (
+        argparse._StoreAction, ['--port'], 'port', None,
+        'Режим serve: порт HTTP API'
+    ),
+    (
+        argparse._StoreAction, ['--refresh-interval'], 'refresh_interval',
+        None, 'Режим serve: как часто обновлять результаты, сек'
+    ),
+    (
+        argparse._StoreTrueAction, ['--async'], 'use_async', None,
+        'Асинхронная загрузка страниц через aiohttp'
+    ),
 ])
 def test_configure_argument_parser(
         action,
@@ -64,3 +141,32 @@ def test_configure_argument_parser(
     assert got_action.help == help_str, (
         f'Укажите help-строку cli аргумента {got_action.dest}'
     )
+
+
+@pytest.mark.parametrize('value', ['0', '-3', 'many'])
+def test_workers_must_be_positive(value):
+    parser = configs.configure_argument_parser(['pep'])
+    with pytest.raises(SystemExit):
+        parser.parse_args(['pep', '--workers', value])
+
+
+def test_expire_rules():
+    parser = configs.configure_argument_parser(['pep'])
+    got = parser.parse_args([
+        'pep', '--expire', 'peps.python.org/pep-*=604800',
+        '--expire', 'peps.python.org=600'
+    ])
+    assert got.expire == [
+        ('peps.python.org/pep-*', 604800), ('peps.python.org', 600)
+    ], 'Правила `--expire` должны разбираться в пары (шаблон, секунды)'
+    with pytest.raises(SystemExit):
+        parser.parse_args(['pep', '--expire', 'peps.python.org'])
+
+
+def test_several_modes():
+    parser = configs.configure_argument_parser(['pep', 'whats-new', 'all'])
+    assert parser.parse_args(['pep', 'whats-new']).mode == [
+        'pep', 'whats-new'
+    ], 'Парсер должен принимать несколько режимов за один запуск'
+    with pytest.raises(SystemExit):
+        parser.parse_args(['pep', 'unknown'])
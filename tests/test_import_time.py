@@ -0,0 +1,55 @@
+import subprocess
+import sys
+
+import pytest
+from conftest import SRC_DIR
+
+# Зависимости, которые загружаются только в тех режимах и форматах
+# вывода, где они нужны.
+LAZY_MODULES = [
+    'aiohttp', 'bs4', 'lxml', 'prettytable', 'requests_cache', 'tqdm'
+]
+# Бюджет на импорт `main`, мкс: с запасом, чтобы тест не зависел
+# от нагрузки на машину, но ловил возврат тяжёлых импортов.
+IMPORT_TIME_BUDGET = 400_000
+RUNS = 3
+
+
+def import_main():
+    """Время импорта по `python -X importtime`: модуль -> мкс с учётом
+    вложенных импортов.
+    """
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import main'],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    modules = {}
+    for line in stderr.splitlines():
+        _, cumulative, module = line.split('|')
+        if cumulative.strip().isdigit():
+            modules[module.strip()] = int(cumulative)
+    return modules
+
+
+@pytest.fixture(scope='module')
+def imported_modules():
+    return [import_main() for _ in range(RUNS)]
+
+
+@pytest.mark.parametrize('module', LAZY_MODULES)
+def test_heavy_dependency_is_lazy(imported_modules, module):
+    assert module not in imported_modules[0], (
+        f'Модуль `{module}` не должен загружаться при импорте `main.py`: '
+        'импортируйте его в режиме или способе вывода, где он нужен'
+    )
+
+
+def test_import_time_budget(imported_modules):
+    got = min(modules['main'] for modules in imported_modules)
+    assert got < IMPORT_TIME_BUDGET, (
+        f'Импорт `main.py` занимает {got / 1000:.0f} мс, бюджет — '
+        f'{IMPORT_TIME_BUDGET / 1000:.0f} мс'
+    )
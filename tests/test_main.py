@@ -1,4 +1,10 @@
+import pstats
+import threading
+
 import pytest
+import requests
+import requests_mock
+from argparse import Namespace
 from pathlib import Path
 try:
     from src import main
@@ -7,6 +13,9 @@ except ModuleNotFoundError:
 except ImportError:
     assert False, 'Убедитесь что в директории `src` есть файл `main.py`'
 
+# Режимы должны работать одинаково с любым движком разбора.
+ENGINE_ARGS = [Namespace(engine='bs4'), Namespace(engine='lxml')]
+
 
 def test_main_file():
     assert hasattr(main, 'whats_new'), (
@@ -30,8 +39,9 @@ def test_main_file():
     )
 
 
-def test_whats_new(mock_session):
-    got = main.whats_new(mock_session)
+@pytest.mark.parametrize('engine_args', ENGINE_ARGS)
+def test_whats_new(mock_session, engine_args):
+    got = main.whats_new(mock_session, engine_args)
     header = ('Ссылка на статью', 'Заголовок', 'Редактор, Автор')
     assert isinstance(got, list), (
         'Функция `whats_new` должна возвращать объект типа `list`'
@@ -52,8 +62,9 @@ def test_whats_new(mock_session):
 
 
 @pytest.mark.skip()
-def test_latest_versions(mock_session):
-    got = main.latest_versions(mock_session)
+@pytest.mark.parametrize('engine_args', ENGINE_ARGS)
+def test_latest_versions(mock_session, engine_args):
+    got = main.latest_versions(mock_session, engine_args)
     assert isinstance(got, list), (
         'Функция `latest_versions` должна возвращать объект типа `list`'
     )
@@ -86,10 +97,11 @@ def test_latest_versions(mock_session):
     )
 
 
-def test_download(monkeypatch, tmp_path, mock_session):
+@pytest.mark.parametrize('engine_args', ENGINE_ARGS)
+def test_download(monkeypatch, tmp_path, mock_session, engine_args):
     mock_base_dir = Path(tmp_path)
     monkeypatch.setattr(main, 'BASE_DIR', mock_base_dir)
-    got = main.download(mock_session)
+    got = main.download(mock_session, engine_args)
     dirs = [
         directory for directory in mock_base_dir.iterdir()
         if directory.is_dir() and directory.name == 'downloads'
@@ -123,7 +135,10 @@ def test_mode_to_function():
             f'{name_func} - это строка.'
         )
         assert (
-            name_func in ['whats-new', 'latest-versions', 'download', 'pep']
+            name_func in [
+                'whats-new', 'latest-versions', 'download', 'pep', 'cache',
+                'prefetch', 'serve', 'pep-query',
+            ]
         ), (
             'В модуле `main.py` в объекте `MODE_TO_FUNCTION` '
             f'нет ключа `{name_func}`'
@@ -134,9 +149,285 @@ def test_mode_to_function():
         )
         assert (
             func.__name__ in [
-                'whats_new', 'latest_versions', 'download', 'pep'
+                'whats_new', 'latest_versions', 'download', 'pep', 'cache',
+                'prefetch', 'serve', 'pep_query',
             ]
         ), (
             'В модуле `main.py` в объекте `MODE_TO_FUNCTION` '
             f'нет значения {func}'
         )
+
+
+PEP_INDEX = (
+    '<section id="numerical-index"><table><tbody>'
+    '<tr><td>SF</td><td><a href="pep-0001/">1</a></td></tr>'
+    '<tr><td>SA</td><td><a href="pep-0002/">2</a></td></tr>'
+    '</tbody></table></section>'
+)
+WHATS_NEW_INDEX = (
+    '<section id="what-s-new-in-python"><div class="toctree-wrapper"><ul>'
+    '<li class="toctree-l1"><a href="3.12.html">3.12</a></li>'
+    '</ul></div></section>'
+)
+
+
+def page_with_etag(text):
+    def respond(request, context):
+        context.headers['ETag'] = '"v1"'
+        if request.headers.get('If-None-Match') == '"v1"':
+            context.status_code = 304
+            return ''
+        return text
+    return respond
+
+
+def test_prefetch(tempfile_session):
+    with requests_mock.Mocker() as mock:
+        mock.get(main.MAIN_PEP_URL, text=PEP_INDEX)
+        mock.get(main.MAIN_DOC_URL + 'whatsnew/', text=WHATS_NEW_INDEX)
+        mock.get(main.MAIN_PEP_URL + 'pep-0001/', text='PEP 1')
+        mock.get(main.MAIN_PEP_URL + 'pep-0002/', text='PEP 2')
+        mock.get(
+            main.MAIN_DOC_URL + 'whatsnew/3.12.html',
+            text=page_with_etag('3.12')
+        )
+        got = [dict(main.prefetch(tempfile_session)[1:])]
+        got.append(dict(main.prefetch(tempfile_session)[1:]))
+        tempfile_session.cache.reset_expiration(0)
+        got.append(dict(main.prefetch(tempfile_session)[1:]))
+    assert got[0] == {
+        'Свежие в кеше': 0,
+        'Перепроверены': 0,
+        'Загружены': 5,
+        'Ошибки загрузки': 0,
+        'Total': 5,
+    }, (
+        'Режим `prefetch` должен загрузить индексы PEP и whats-new '
+        'и все страницы, на которые они ссылаются'
+    )
+    assert got[1]['Свежие в кеше'] == 5, (
+        'При повторном запуске `prefetch` все страницы должны '
+        'браться из кеша'
+    )
+    assert (got[2]['Перепроверены'], got[2]['Загружены']) == (1, 4), (
+        'Устаревшие страницы с ETag должны перепроверяться условным '
+        'запросом, остальные — загружаться заново'
+    )
+    main.parse_memo.clear()
+    main.parse_memo_changed.clear()
+
+
+def build_pep_records_index(*codes):
+    return (
+        '<section id="numerical-index"><table><tbody>' + ''.join(
+            f'<tr><td>{code}</td><td><a href="pep-{number:04}/">{number}</a>'
+            f'</td><td>PEP {number}</td><td>Author {number}</td></tr>'
+            for number, code in enumerate(codes, start=1)
+        ) + '</tbody></table></section>'
+    )
+
+
+def build_pep_card(status):
+    return f'<dl><dt>Status</dt><dd>{status}</dd></dl>'
+
+
+@pytest.fixture
+def loaded_peps(monkeypatch):
+    """Списки ссылок на карточки, которые режим `pep` перепроверял."""
+    loaded = []
+    get_page_loader = main.get_page_loader
+
+    def get_spied_loader(cli_args=None):
+        load = get_page_loader(cli_args)
+
+        def spied_load(session, urls, *args, **kwargs):
+            if urls != [main.MAIN_PEP_URL]:
+                loaded.append([url.rsplit('/', 2)[-2] for url in urls])
+            return load(session, urls, *args, **kwargs)
+
+        return spied_load
+
+    monkeypatch.setattr(main, 'get_page_loader', get_spied_loader)
+    return loaded
+
+
+def test_pep_rechecks_only_outdated_cards(
+        monkeypatch, tmp_path, tempfile_session, loaded_peps
+):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    card_urls = [main.MAIN_PEP_URL + f'pep-000{number}/' for number in (1, 2)]
+    with requests_mock.Mocker() as mock:
+        mock.get(main.MAIN_PEP_URL, text=build_pep_records_index('PA', 'SF'))
+        cards = [
+            mock.get(card_urls[0], text=build_pep_card('Active')),
+            mock.get(card_urls[1], text=build_pep_card('Final')),
+        ]
+        expected = [
+            ('Статус', 'Количество'), ('Active', 1), ('Final', 1),
+            ('Total', 2),
+        ]
+        assert main.pep(tempfile_session) == expected
+        assert [card.call_count for card in cards] == [1, 1]
+        assert main.pep(tempfile_session) == expected
+        assert [card.call_count for card in cards] == [1, 1], (
+            'PEP со свежей страницей в кеше и прежней строкой индекса '
+            'не нужно загружать повторно'
+        )
+        mock.get(main.MAIN_PEP_URL, text=build_pep_records_index('PA', 'SA'))
+        tempfile_session.cache.delete(urls=[main.MAIN_PEP_URL])
+        main.pep(tempfile_session)
+        assert loaded_peps[1:] == [[], ['pep-0002']], (
+            'Перепроверять нужно только PEP, строка которого в индексе '
+            'изменилась'
+        )
+        mock.get(card_urls[0], exc=requests.exceptions.ConnectionError)
+        tempfile_session.cache.reset_expiration(0)
+        assert main.pep(tempfile_session) == [
+            ('Статус', 'Количество'), ('Active', 1), ('Final', 1),
+            ('Total', 2),
+        ], (
+            'Если карточку PEP не удалось загрузить, '
+            'нужно оставить её прежний статус'
+        )
+        assert loaded_peps[-1] == ['pep-0001', 'pep-0002']
+        mock.get(card_urls[0], text=build_pep_card('Active'))
+        main.pep(tempfile_session, Namespace(full=True))
+        assert loaded_peps[-1] == ['pep-0001', 'pep-0002'], (
+            'С `--full` нужно перепроверить все PEP'
+        )
+    connection = main.open_pep_state(tmp_path / main.PEP_STATE_FILE)
+    records = main.load_pep_records(connection)
+    connection.close()
+    assert [
+        (record.number, record.index_status, record.page_status)
+        for record in records
+    ] == [(1, 'A', 'Active'), (2, 'A', 'Final')], (
+        'Режим `pep` должен сохранять записи PEP для `pep-query`'
+    )
+    main.parse_memo.clear()
+    main.parse_memo_changed.clear()
+
+
+def test_get_modes():
+    got = main.get_modes(Namespace(mode=['pep', 'all', 'pep-query']))
+    assert got == [
+        'pep', 'whats-new', 'latest-versions', 'download', 'pep-query'
+    ], (
+        'Режим `all` должен заменяться основными режимами, '
+        'а повторяющиеся режимы запускаться один раз'
+    )
+    for mode in ('serve', 'cache', 'prefetch'):
+        assert main.get_modes(Namespace(mode=[mode, mode])) == [mode]
+    for modes in (
+        ['serve', 'latest-versions'],
+        ['all', 'serve'],
+        ['pep', 'cache'],
+        ['prefetch', 'whats-new'],
+        ['cache', 'prefetch'],
+    ):
+        with pytest.raises(ValueError):
+            main.get_modes(Namespace(mode=modes))
+
+
+def test_count_concurrent_modes():
+    assert main.count_concurrent_modes(['pep', 'whats-new']) == 2
+    assert main.count_concurrent_modes(['serve']) == len(main.SERVE_MODES), (
+        'Пул соединений режима `serve` нужно рассчитывать на все режимы, '
+        'которые он обновляет одновременно'
+    )
+
+
+def test_run_modes_outputs_each_mode(monkeypatch):
+    outputs = []
+
+    def broken(session, cli_args=None):
+        raise RuntimeError('broken')
+
+    monkeypatch.setitem(main.MODE_TO_FUNCTION, 'pep', broken)
+    monkeypatch.setitem(
+        main.MODE_TO_FUNCTION, 'latest-versions',
+        lambda session, cli_args=None: [('Версия',), ('3.12',)]
+    )
+    monkeypatch.setattr(
+        main, 'control_output',
+        lambda results, cli_args: outputs.append((cli_args.mode, results))
+    )
+    main.run_modes(None, Namespace(output=None), ['pep', 'latest-versions'])
+    assert outputs == [('latest-versions', [('Версия',), ('3.12',)])], (
+        'Сбой одного режима не должен мешать выводу остальных'
+    )
+
+
+def test_refresh_results_keeps_previous_on_failure(monkeypatch, tmp_path):
+    def broken(session, cli_args=None):
+        raise RuntimeError('broken')
+
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    for mode in main.SERVE_MODES:
+        monkeypatch.setitem(
+            main.MODE_TO_FUNCTION, mode,
+            lambda session, cli_args=None: [('Режим',), (cli_args.mode,)]
+        )
+    results = dict.fromkeys(main.SERVE_MODES)
+    main.refresh_results(None, Namespace(), results)
+    assert results['pep']['results'] == [{'Режим': 'pep'}], (
+        'Режим `serve` должен хранить результат каждого режима в памяти'
+    )
+    monkeypatch.setitem(main.MODE_TO_FUNCTION, 'pep', broken)
+    main.refresh_results(None, Namespace(), results)
+    assert results['pep']['results'] == [{'Режим': 'pep'}], (
+        'При сбое обновления должен остаться прежний результат режима'
+    )
+    assert main.reset_timings() == {}, (
+        'После каждого обновления замеры этапов нужно выводить в лог '
+        'и очищать, чтобы они не копились в режиме `serve`'
+    )
+
+
+def test_pep_query(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    connection = main.open_pep_state(tmp_path / main.PEP_STATE_FILE)
+    main.save_pep_records(connection, [
+        main.PepRecord(8, 'Style Guide', 'Process', 'A', 'Active', 'Guido',
+                       'pep-0008/'),
+        main.PepRecord(634, 'Pattern Matching', 'Standards Track', 'A',
+                       'Accepted', 'Brandt', 'pep-0634/'),
+    ])
+    connection.close()
+    got = main.pep_query(None, Namespace(
+        status='Accepted', pep_type='Standards Track', count_by=None
+    ))
+    assert [row[0] for row in got[1:]] == [634], (
+        'Режим `pep-query` должен выбирать PEP из сохранённых записей '
+        'по статусу и типу'
+    )
+    got = main.pep_query(None, Namespace(
+        status=None, pep_type=None, count_by='type'
+    ))
+    assert got[1:] == [
+        ('Process', 1), ('Standards Track', 1), ('Total', 2)
+    ], 'С `--count-by` режим должен выводить количество PEP по группам'
+
+
+def profiled_worker():
+    return sum(range(1000))
+
+
+def run_worker_thread():
+    worker = threading.Thread(target=profiled_worker)
+    worker.start()
+    worker.join()
+    return 'done'
+
+
+def test_run_profiled_includes_worker_threads(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, 'LOG_DIR', tmp_path)
+    assert main.run_profiled(run_worker_thread) == 'done'
+    profiles = list(tmp_path.glob('*.pstats'))
+    assert len(profiles) == 1, '`--profile` должен сохранять один профиль'
+    functions = {
+        function for _, _, function in pstats.Stats(str(profiles[0])).stats
+    }
+    assert {'run_worker_thread', 'profiled_worker'} <= functions, (
+        'Профиль должен включать вызовы из рабочих потоков'
+    )
@@ -90,3 +90,63 @@ def test_output_file():
     assert hasattr(outputs, 'file_output'), (
         'Напишите функцию `file_output` в модуле `output.py`'
     )
+
+
+def test_file_output_streams_rows(monkeypatch, tmp_path):
+    monkeypatch.setattr(outputs, 'BASE_DIR', tmp_path)
+    monkeypatch.setattr(outputs, 'OUTPUT_FLUSH_INTERVAL', 0)
+    written = []
+
+    def rows():
+        yield ('Статус', 'Количество')
+        yield ('Active', 1)
+        [file_path] = (tmp_path / 'results').iterdir()
+        written.append(file_path.read_text(encoding='utf-8'))
+        yield ('Final', 2)
+
+    outputs.control_output(rows(), cli_args('pep', 'file'))
+    assert written == ['"Статус","Количество"\n"Active","1"\n'], (
+        'Строки результата нужно записывать в файл по мере получения'
+    )
+
+
+def test_default_output_accepts_generator(capsys):
+    outputs.control_output(
+        (row for row in [('Статус', 'Количество'), ('Active', 1)]),
+        cli_args('pep', None)
+    )
+    captured_out, _ = capsys.readouterr()
+    assert captured_out == 'Статус Количество\nActive 1\n'
+
+
+def test_jsonl_output(monkeypatch, tmp_path):
+    monkeypatch.setattr(outputs, 'BASE_DIR', tmp_path)
+    outputs.control_output(
+        [('Статус', 'Количество'), ('Active', 1), ('Total', 1)],
+        cli_args('pep', 'jsonl')
+    )
+    [file_path] = (tmp_path / 'results').glob('pep_*.jsonl')
+    assert file_path.read_text(encoding='utf-8').splitlines() == [
+        '{"Статус": "Active", "Количество": 1}',
+        '{"Статус": "Total", "Количество": 1}',
+    ], 'Каждая строка результата должна быть JSON-объектом с заголовками'
+
+
+def test_sqlite_output_appends_runs(monkeypatch, tmp_path):
+    monkeypatch.setattr(outputs, 'BASE_DIR', tmp_path)
+    for count in (1, 2):
+        outputs.control_output(
+            (row for row in [('Статус', 'Количество'), ('Active', count)]),
+            cli_args('pep', 'sqlite')
+        )
+    connection = outputs.open_results_db(
+        tmp_path / 'results' / 'results.sqlite3'
+    )
+    got = connection.execute(
+        "SELECT mode, json_extract(data, '$.Количество') FROM results "
+        'ORDER BY rowid'
+    ).fetchall()
+    connection.close()
+    assert got == [('pep', 1), ('pep', 2)], (
+        'Результаты каждого запуска должны добавляться в базу'
+    )
@@ -0,0 +1,32 @@
+try:
+    from src import parse_memo
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `parse_memo.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `parse_memo.py`'
+
+
+def test_parse_memo_roundtrip(tmp_path):
+    path = tmp_path / 'memo.sqlite3'
+    memo = {
+        ('https://peps.python.org/', 'parsers.parse_pep_index'): (
+            'hash-1', [('pep-0001/', 'A'), ('pep-0401/', 'R')]
+        ),
+        ('https://peps.python.org/pep-0001/', 'parsers.parse_pep_status'): (
+            'hash-2', 'Active'
+        ),
+    }
+    connection = parse_memo.open_parse_memo(path)
+    parse_memo.save_parse_memo(connection, memo, memo.keys())
+    connection.close()
+    connection = parse_memo.open_parse_memo(path)
+    assert parse_memo.load_parse_memo(connection) == memo, (
+        'Сохранённые результаты разбора должны загружаться без изменений'
+    )
+    connection.execute('PRAGMA user_version = 0')
+    connection.close()
+    connection = parse_memo.open_parse_memo(path)
+    assert parse_memo.load_parse_memo(connection) == {}, (
+        'Результаты прежней версии парсеров нужно отбрасывать'
+    )
+    connection.close()
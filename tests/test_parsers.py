@@ -0,0 +1,175 @@
+import pytest
+try:
+    from src import lxml_parsers, parsers
+except ModuleNotFoundError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файлы `parsers.py` '
+        'и `lxml_parsers.py`'
+    )
+except ImportError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файлы `parsers.py` '
+        'и `lxml_parsers.py`'
+    )
+
+PEP_PAGE = (
+    '<html><body><section id="pep-content"><h1>PEP 8</h1>'
+    '<dl class="rfc2822 field-list simple">'
+    '<dt class="field-odd">Author<span class="colon">:</span></dt>'
+    '<dd class="field-odd">Guido van Rossum</dd>'
+    '<dt class="field-even">Status<span class="colon">:</span></dt>'
+    '<dd class="field-even"><abbr title="Accepted">Active</abbr></dd>'
+    '</dl><p>Style Guide for Python Code</p></section></body></html>'
+)
+PEP_INDEX_PAGE = (
+    '<html><body><section id="numerical-index"><table><thead>'
+    '<tr><th>Status</th><th>PEP</th></tr></thead><tbody>'
+    '<tr><td><abbr title="Process, Active">PA</abbr></td>'
+    '<td><a href="pep-0001/">1</a></td></tr>'
+    '<tr><td><abbr title="Standards Track, Draft">S</abbr></td>'
+    '<td><a href="pep-0695/">695</a></td></tr>'
+    '</tbody></table></section></body></html>'
+)
+PEP_INDEX_RECORDS_PAGE = (
+    '<html><body><section id="numerical-index"><table><tbody>'
+    '<tr><td><abbr title="Process, Active">PA</abbr></td>'
+    '<td><a href="pep-0001/">1</a></td>'
+    '<td><a href="pep-0001/">PEP Purpose and Guidelines</a></td>'
+    '<td>Barry Warsaw, Jeremy Hylton</td></tr>'
+    '</tbody></table></section></body></html>'
+)
+PEP_INDEX_DUPLICATES_PAGE = (
+    '<html><body><section id="index-by-category"><table><tbody>'
+    '<tr><td>SF</td><td><a href="pep-0008/">8</a></td></tr>'
+    '</tbody></table></section>'
+    '<section id="numerical-index"><table><tbody>'
+    '<tr><td>PA</td><td><a href="pep-0001/">1</a></td></tr>'
+    '<tr><td>PA</td><td><a href="pep-0001/">1</a></td></tr>'
+    '<tr><td>SD</td><td><a href="pep-0695/">695</a></td></tr>'
+    '</tbody></table></section></body></html>'
+)
+VERSION_PAGE = (
+    '<html><body><section><h1>What’s New In Python 3.11</h1>'
+    '<dl class="field-list"><dt>Editor</dt>\n<dd>Pablo Galindo Salgado</dd>'
+    '</dl></section></body></html>'
+)
+WHATS_NEW_INDEX_PAGE = (
+    '<html><body><section id="what-s-new-in-python">'
+    '<div class="toctree-wrapper compound"><ul>'
+    '<li class="toctree-l1"><a href="3.11.html">3.11</a>'
+    '<ul><li class="toctree-l2"><a href="3.11.html#summary">S</a></li></ul>'
+    '</li><li class="toctree-l1"><a href="3.10.html">3.10</a></li>'
+    '</ul></div></section></body></html>'
+)
+MAIN_DOC_PAGE = (
+    '<html><body><div class="menu-wrapper"><h3>Docs by version</h3><ul>'
+    '<li><a href="https://docs.python.org/3.12/">Python 3.12 (stable)</a>'
+    '</li><li><a href="https://www.python.org/doc/versions/">'
+    'All versions</a></li></ul></div></body></html>'
+)
+ENGINES = [parsers, lxml_parsers]
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_parse_pep_status(engine):
+    assert engine.parse_pep_status(PEP_PAGE) == 'Active', (
+        'Функция `parse_pep_status` должна возвращать статус из карточки PEP'
+    )
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_parse_pep_status_without_dl(engine):
+    with pytest.raises(BaseException) as excinfo:
+        engine.parse_pep_status('<html><body></body></html>')
+    assert excinfo.typename == 'ParserFindTagException'
+
+
+@pytest.mark.parametrize('page', ['', '  \n'])
+@pytest.mark.parametrize('engine', ENGINES)
+def test_parse_empty_page(engine, page):
+    with pytest.raises(BaseException) as excinfo:
+        engine.parse_pep_status(page)
+    assert excinfo.typename == 'ParserFindTagException', (
+        'На пустой странице оба движка должны выбрасывать '
+        '`ParserFindTagException`'
+    )
+    assert engine.parse_pep_index(page) == [], (
+        'Индекс PEP пустой страницы должен быть пустым'
+    )
+    assert engine.parse_whats_new_index(page) == [], (
+        'Список нововведений пустой страницы должен быть пустым'
+    )
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_parse_version_info(engine):
+    assert engine.parse_version_info(VERSION_PAGE) == (
+        'What’s New In Python 3.11', 'Editor Pablo Galindo Salgado'
+    ), (
+        'Функция `parse_version_info` должна возвращать заголовок '
+        'и описание версии'
+    )
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_parse_pep_index(engine):
+    assert engine.parse_pep_index(PEP_INDEX_PAGE) == [
+        ('pep-0001/', 'A'), ('pep-0695/', '')
+    ], (
+        'Функция `parse_pep_index` должна возвращать ссылки и статусы PEP'
+    )
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_parse_pep_index_skips_duplicates(engine):
+    assert engine.parse_pep_index(PEP_INDEX_DUPLICATES_PAGE) == [
+        ('pep-0001/', 'A'), ('pep-0695/', 'D')
+    ], (
+        'Функция `parse_pep_index` должна брать PEP только из числового '
+        'индекса и возвращать каждый номер один раз'
+    )
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_parse_pep_index_records(engine):
+    assert engine.parse_pep_index_records(PEP_INDEX_RECORDS_PAGE) == [(
+        'pep-0001/', 'PA', '1', 'PEP Purpose and Guidelines',
+        'Barry Warsaw, Jeremy Hylton'
+    )], (
+        'Функция `parse_pep_index_records` должна возвращать ссылку, '
+        'код типа и статуса, номер, заголовок и авторов PEP'
+    )
+    with pytest.raises(BaseException) as excinfo:
+        engine.parse_pep_index_records(PEP_INDEX_PAGE)
+    assert excinfo.typename == 'ParserFindTagException'
+    with pytest.raises(BaseException) as excinfo:
+        engine.parse_pep_index(
+            PEP_INDEX_PAGE.replace('<a href="pep-0695/">695</a>', '695')
+        )
+    assert excinfo.typename == 'ParserFindTagException', (
+        'Если в строке индекса нет ссылки на PEP, '
+        'нужно выбросить `ParserFindTagException`'
+    )
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_parse_whats_new_index(engine):
+    assert engine.parse_whats_new_index(WHATS_NEW_INDEX_PAGE) == [
+        '3.11.html', '3.10.html'
+    ], (
+        'Функция `parse_whats_new_index` должна возвращать ссылки '
+        'на страницы версий'
+    )
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_parse_latest_versions(engine):
+    assert engine.parse_latest_versions(MAIN_DOC_PAGE) == [
+        ('https://docs.python.org/3.12/', 'Python 3.12 (stable)'),
+        ('https://www.python.org/doc/versions/', 'All versions'),
+    ], (
+        'Функция `parse_latest_versions` должна возвращать ссылки '
+        'и подписи из списка версий'
+    )
+    with pytest.raises(RuntimeError):
+        engine.parse_latest_versions('<html><body></body></html>')
@@ -0,0 +1,41 @@
+try:
+    from src import pep_index
+    from src.pep_state import PepRecord
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `pep_index.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `pep_index.py`'
+
+RECORDS = [
+    PepRecord(8, 'Style Guide', 'Process', 'A', 'Active', 'Guido', 'pep-8'),
+    PepRecord(484, 'Type Hints', 'Standards Track', '', 'Final', 'Guido',
+              'pep-484'),
+    PepRecord(572, 'Walrus', 'Standards Track', '', 'Accepted', 'Chris',
+              'pep-572'),
+    PepRecord(634, 'Pattern Matching', 'Standards Track', 'A', 'Accepted',
+              'Brandt', 'pep-634'),
+    PepRecord(3333, 'WSGI', 'Informational', '', 'Final', 'P.J.', 'pep-3333'),
+]
+
+
+def test_select_records():
+    indexes = pep_index.build_indexes(RECORDS)
+    got = pep_index.select_records(
+        RECORDS, indexes, page_status='accepted', type='Standards Track'
+    )
+    assert [record.number for record in got] == [572, 634], (
+        'Выборка должна учитывать все условия без учёта регистра'
+    )
+    assert pep_index.select_records(
+        RECORDS, indexes, page_status='Final', type=None
+    ) == [RECORDS[1], RECORDS[4]], 'Условия со значением None не учитываются'
+    assert pep_index.select_records(RECORDS, indexes) == RECORDS
+    assert pep_index.select_records(
+        RECORDS, indexes, page_status='Withdrawn'
+    ) == []
+
+
+def test_count_records():
+    assert pep_index.count_records(RECORDS, 'type') == {
+        'Process': 1, 'Standards Track': 3, 'Informational': 1
+    }
@@ -0,0 +1,50 @@
+try:
+    from src import pep_state
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `pep_state.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `pep_state.py`'
+
+
+def test_pep_state_roundtrip(tmp_path):
+    path = tmp_path / 'state.sqlite3'
+    state = {
+        'https://peps.python.org/pep-0001/': pep_state.PepState(
+            'A', 'Active', 'hash-1'
+        ),
+        'https://peps.python.org/pep-0401/': pep_state.PepState(
+            'R', 'April Fool!', 'hash-401'
+        ),
+    }
+    connection = pep_state.open_pep_state(path)
+    pep_state.save_pep_state(connection, state)
+    connection.close()
+    connection = pep_state.open_pep_state(path)
+    assert pep_state.load_pep_state(connection) == state, (
+        'Сохранённое состояние PEP должно загружаться без изменений'
+    )
+    del state['https://peps.python.org/pep-0401/']
+    pep_state.save_pep_state(connection, state)
+    assert pep_state.load_pep_state(connection) == state, (
+        'PEP, которых нет в новом состоянии, должны удаляться'
+    )
+    connection.close()
+
+
+def test_pep_records_roundtrip(tmp_path):
+    records = [
+        pep_state.PepRecord(
+            1, 'PEP Purpose and Guidelines', 'Process', 'A', 'Active',
+            'Barry Warsaw, Jeremy Hylton', 'https://peps.python.org/pep-0001/'
+        ),
+        pep_state.PepRecord(
+            8, 'Style Guide for Python Code', 'Process', 'A', 'Active',
+            'Guido van Rossum', 'https://peps.python.org/pep-0008/'
+        ),
+    ]
+    connection = pep_state.open_pep_state(tmp_path / 'state.sqlite3')
+    pep_state.save_pep_records(connection, records[::-1])
+    assert pep_state.load_pep_records(connection) == records, (
+        'Записи PEP должны загружаться без изменений в порядке номеров'
+    )
+    connection.close()
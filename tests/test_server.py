@@ -0,0 +1,77 @@
+import json
+import threading
+from http import HTTPStatus
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+try:
+    from src import server
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `server.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `server.py`'
+
+PEP_ROWS = [('Статус', 'Количество'), ('Active', 3), ('Final', 5)]
+
+
+@pytest.fixture
+def results():
+    results = dict.fromkeys(['pep', 'whats-new'])
+    server.set_results(results, 'pep', PEP_ROWS)
+    return results
+
+
+def test_route(results):
+    status, body = server.route(results, '/pep')
+    assert status == HTTPStatus.OK
+    assert body['results'] == [
+        {'Статус': 'Active', 'Количество': 3},
+        {'Статус': 'Final', 'Количество': 5},
+    ], 'Строки результата должны отдаваться записями с ключами из заголовка'
+    status, body = server.route(results, '/pep', 'fin')
+    assert body['results'] == [{'Статус': 'Final', 'Количество': 5}], (
+        'Параметр `q` должен оставлять записи, где встречается текст'
+    )
+    assert server.route(results, '/whats-new')[0] == (
+        HTTPStatus.SERVICE_UNAVAILABLE
+    ), 'Пока режим не выполнен, API должно отвечать 503'
+    assert server.route(results, '/download')[0] == HTTPStatus.NOT_FOUND
+    status, body = server.route(results, '/')
+    assert set(body['modes']) == {'pep', 'whats-new'}
+    assert body['modes']['whats-new']['updated_at'] is None
+
+
+def test_server_answers_json(results):
+    http_server = server.create_server(('127.0.0.1', 0), results)
+    threading.Thread(target=http_server.serve_forever, daemon=True).start()
+    url = 'http://127.0.0.1:{}/'.format(http_server.server_address[1])
+    try:
+        with urlopen(url + 'pep') as response:
+            assert response.headers['Content-Type'].startswith(
+                'application/json'
+            )
+            assert json.load(response)['mode'] == 'pep'
+        with pytest.raises(HTTPError) as error:
+            urlopen(url + 'whats-new')
+        assert error.value.code == HTTPStatus.SERVICE_UNAVAILABLE
+    finally:
+        http_server.shutdown()
+        http_server.server_close()
+
+
+def test_refresh_periodically_stops():
+    calls = []
+    stop = threading.Event()
+
+    def refresh():
+        calls.append(1)
+        if len(calls) == 3:
+            stop.set()
+        raise RuntimeError('Сбой обновления')
+
+    server.refresh_periodically(refresh, 0, stop)
+    assert len(calls) == 3, (
+        'Обновление должно повторяться, несмотря на сбои, '
+        'пока не установлено событие остановки'
+    )
@@ -0,0 +1,104 @@
+import time
+from argparse import Namespace
+try:
+    from src import sessions, utils
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `sessions.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `sessions.py`'
+
+
+def test_create_adapter():
+    adapter = sessions.create_adapter(
+        Namespace(workers=25, retries=4, timeout=7)
+    )
+    assert adapter._pool_maxsize == 25, (
+        'Размер пула соединений должен совпадать с количеством потоков'
+    )
+    assert adapter.max_retries.total == 4
+    assert 502 in adapter.max_retries.status_forcelist, (
+        'Запросы с временными ошибками сервера нужно повторять'
+    )
+    assert adapter.timeout == 7
+
+
+def test_get_urls_expire_after():
+    got = sessions.get_urls_expire_after([('peps.python.org', 60)])
+    assert list(got)[0] == 'peps.python.org', (
+        'Правила из командной строки должны проверяться первыми'
+    )
+    assert got['peps.python.org'] == 60
+    assert 'peps.python.org/pep-*' in got
+
+
+def test_get_connection_stats(tempfile_session):
+    assert sessions.get_connection_stats(tempfile_session) == (0, 0)
+
+
+def test_create_session_rate_limiter(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    session = sessions.create_session(
+        Namespace(rate=2.5, burst=3, retries=1, expire=[])
+    )
+    assert session.rate_limiter.rate == 2.5
+    assert session.rate_limiter.burst == 3
+    assert session.rate_limiter.retries == 1
+
+
+def test_compressed_serializer(requests_mock, tmp_path):
+    url = 'https://peps.python.org/pep-0008/'
+    html = '<dl><dt>Status</dt><dd>Active</dd></dl>' * 5000
+    requests_mock.get(url, text=html)
+    sizes = {}
+    for serializer in (
+        sessions.requests_cache.pickle_serializer,
+        sessions.compressed_serializer,
+    ):
+        session = sessions.requests_cache.CachedSession(
+            str(tmp_path / serializer.name), serializer=serializer
+        )
+        session.get(url)
+        response = session.get(url)
+        assert response.from_cache and response.text == html, (
+            'Ответ из кеша должен совпадать с исходным'
+        )
+        sizes[serializer.name] = session.cache.responses.size()
+    assert sizes['pickle_zlib'] * 5 < sizes['pickle'], (
+        'Ответы в кеше должны храниться в сжатом виде'
+    )
+
+
+def test_retry_after_is_handled_once(monkeypatch, tmp_path, local_server):
+    monkeypatch.chdir(tmp_path)
+    base_url, requests_count = local_server({
+        '/limited': lambda count: (429, {'Retry-After': '0'}),
+    })
+    session = sessions.create_session(
+        Namespace(retries=2, cache_backend='memory', expire=[])
+    )
+    assert utils.get_response(session, base_url + '/limited').status_code == (
+        429
+    )
+    assert requests_count == {'/limited': 3}, (
+        'Ответы 429 и 503 должен повторять только `send_request` с паузой '
+        'для всего хоста, а не ещё и адаптер urllib3'
+    )
+
+
+def test_cache_hits_do_not_consume_rate_limit(
+    monkeypatch, tmp_path, local_server
+):
+    monkeypatch.chdir(tmp_path)
+    base_url, requests_count = local_server({
+        '/page': lambda count: (200, {}),
+    })
+    session = sessions.create_session(
+        Namespace(rate=1, burst=1, cache_backend='memory', expire=[])
+    )
+    started = time.monotonic()
+    for _ in range(5):
+        utils.get_response(session, base_url + '/page')
+    assert requests_count == {'/page': 1}
+    assert time.monotonic() - started < 0.5, (
+        'Ответы из кеша не должны расходовать токены ограничителя частоты'
+    )
@@ -0,0 +1,54 @@
+import time
+try:
+    from src import throttling
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `throttling.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `throttling.py`'
+
+
+def test_token_bucket_limits_rate():
+    bucket = throttling.TokenBucket(rate=100, capacity=10)
+    started = time.monotonic()
+    for _ in range(3):
+        bucket.consume(10)
+    elapsed = time.monotonic() - started
+    assert 0.15 <= elapsed < 1, (
+        '`TokenBucket.consume` должен ждать, пока накопятся токены'
+    )
+
+
+def test_token_bucket_burst_without_delay():
+    bucket = throttling.TokenBucket(rate=1, capacity=5)
+    started = time.monotonic()
+    bucket.consume(5)
+    assert time.monotonic() - started < 0.1, (
+        'Запас токенов `capacity` должен расходоваться без ожидания'
+    )
+
+
+def test_host_rate_limiter_pause_is_per_host():
+    limiter = throttling.HostRateLimiter()
+    limiter.pause('https://peps.python.org/pep-0001/', 0.2)
+    started = time.monotonic()
+    limiter.wait('https://docs.python.org/3/')
+    assert time.monotonic() - started < 0.1, (
+        'Пауза для одного хоста не должна задерживать запросы к другим'
+    )
+    limiter.wait('https://peps.python.org/pep-0002/')
+    assert time.monotonic() - started >= 0.15, (
+        'Запросы к хосту должны ждать окончания паузы'
+    )
+
+
+def test_host_rate_limiter_reserve_does_not_block():
+    limiter = throttling.HostRateLimiter(rate=10, burst=1)
+    started = time.monotonic()
+    delays = [limiter.reserve('https://peps.python.org/') for _ in range(3)]
+    assert time.monotonic() - started < 0.05, (
+        '`HostRateLimiter.reserve` должен возвращать задержку, не блокируя '
+        'поток'
+    )
+    assert delays[0] == 0 and 0.15 <= delays[2] <= 0.2, (
+        'Каждый следующий запрос сверх запаса должен ждать дольше'
+    )
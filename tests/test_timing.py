@@ -0,0 +1,51 @@
+import time
+
+try:
+    from src import timing
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `timing.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `timing.py`'
+
+
+def test_summarize_timings():
+    got = timing.summarize_timings({
+        'разбор HTML': [value / 1000 for value in range(1, 101)],
+    })
+    assert got == [
+        ('Этап', 'Вызовов', 'Всего, мс', 'p50, мс', 'p95, мс', 'Макс, мс'),
+        ('разбор HTML', 100, 5050.0, 50.0, 95.0, 100.0),
+    ]
+
+
+def test_timed_excludes_nested_stages():
+    timing.stage_timings.clear()
+    with timing.timed('outer'):
+        with timing.timed('inner'):
+            time.sleep(0.05)
+    [outer] = timing.stage_timings['outer']
+    [inner] = timing.stage_timings['inner']
+    assert inner >= 0.05
+    assert outer < 0.01, (
+        'Время вложенных этапов не должно учитываться во внешнем этапе'
+    )
+    timing.stage_timings.clear()
+
+
+def test_timed_rows_records_one_call():
+    timing.stage_timings.clear()
+    rows = list(timing.timed_rows('режим pep', iter([('a', 1), ('b', 2)])))
+    assert rows == [('a', 1), ('b', 2)]
+    assert len(timing.stage_timings['режим pep']) == 1, (
+        'Получение всех строк режима нужно учитывать как один вызов'
+    )
+    timing.stage_timings.clear()
+
+
+def test_reset_timings():
+    timing.stage_timings.clear()
+    timing.record_timing('разбор HTML', 0.5)
+    assert timing.reset_timings() == {'разбор HTML': [0.5]}
+    assert not timing.stage_timings, (
+        '`reset_timings` должен очищать накопленные замеры'
+    )
@@ -1,3 +1,10 @@
+import multiprocessing
+import sys
+import threading
+import time
+from argparse import Namespace
+from concurrent.futures import Future, TimeoutError
+
 import pytest
 import requests
 import requests_mock
@@ -54,3 +61,186 @@ def test_get_response(mock_session):
             'делает запрос к странице и возвращает ответ. \n'
             'Кстати: You are breathtaken!'
         )
+
+
+def test_run_concurrently_keeps_order():
+    items = [5, 1, 4, 2, 3]
+    got = [
+        future.result() for future in utils.run_concurrently(
+            lambda item: time.sleep(item / 1000) or item, items, workers=5
+        )
+    ]
+    assert got == items, (
+        'Функция `run_concurrently` должна возвращать результаты '
+        'в порядке исходных элементов'
+    )
+
+
+def test_get_response_counts_cache_usage(mock_session):
+    utils.cache_stats.clear()
+    for _ in range(3):
+        utils.get_response(mock_session, 'mock://docs.python.org/3/')
+    assert utils.cache_stats == {'misses': 1, 'hits': 2}, (
+        'Функция `get_response` должна учитывать ответы из кеша и из сети'
+    )
+
+
+def test_parse_page_html_memoizes_result():
+    calls = []
+
+    def parser(html):
+        calls.append(html)
+        return html.upper()
+
+    url = 'https://peps.python.org/pep-9999/'
+    utils.parse_memo.clear()
+    assert utils.parse_page_html(url, 'active', parser).result() == 'ACTIVE'
+    assert utils.parse_page_html(url, 'active', parser).result() == 'ACTIVE'
+    assert calls == ['active'], (
+        'Страницу с прежним содержимым не нужно разбирать повторно'
+    )
+    assert utils.parse_page_html(url, 'final', parser).result() == 'FINAL', (
+        'Изменившуюся страницу нужно разобрать заново'
+    )
+    utils.parse_memo.clear()
+    utils.parse_memo_changed.clear()
+
+
+def test_parse_pool_does_not_inherit_held_locks():
+    from src import lxml_parsers
+    # Блокировка замеров того модуля `timing`, которым пользуется парсер.
+    stage_timings_lock = sys.modules['timing'].stage_timings_lock
+    parse_pool = utils.open_parse_pool(Namespace(parse_processes=1))
+    try:
+        with stage_timings_lock:
+            got = parse_pool.submit(
+                lxml_parsers.parse_pep_status,
+                '<dl><dt>Status</dt><dd>Active</dd></dl>'
+            ).result(timeout=30)
+    except TimeoutError:
+        for process in multiprocessing.active_children():
+            process.kill()
+        raise AssertionError(
+            'Процессы разбора не должны наследовать блокировки, '
+            'занятые другими потоками'
+        )
+    finally:
+        parse_pool.shutdown(wait=False, cancel_futures=True)
+    assert got == 'Active'
+
+
+class PendingParsePool:
+    """Пул разбора, который разбирает страницы только по команде."""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, parser, html):
+        future = Future()
+        self.submitted.append((future, parser, html))
+        return future
+
+    def finish(self):
+        for future, parser, html in self.submitted:
+            future.set_result(parser(html))
+
+
+def test_load_pages_does_not_wait_for_parse_pool(mock_session):
+    mock_session.parse_pool = PendingParsePool()
+    urls = ['mock://docs.python.org/3/', 'mock://peps.python.org/']
+    pages = []
+    loader = threading.Thread(target=lambda: pages.extend(
+        utils.load_pages(mock_session, urls, str.upper)
+    ), daemon=True)
+    loader.start()
+    loader.join(timeout=10)
+    assert not loader.is_alive() and len(pages) == 2, (
+        'Потоки загрузки должны передавать страницы в пул разбора, '
+        'не дожидаясь результата'
+    )
+    assert not any(page.done() for page in pages)
+    mock_session.parse_pool.finish()
+    assert [page.result() for page in pages] == ['YOU ARE BREATHTAKEN'] * 2
+
+
+ARCHIVE_URL = MAIN_DOC_URL + 'archives/python-docs-pdf-a4.zip'
+ARCHIVE = b'PK' + bytes(range(256)) * 64
+
+
+def archive_response(request, context):
+    context.headers['ETag'] = '"v1"'
+    byte_range = request.headers.get('Range')
+    if byte_range and request.headers.get('If-Range') == '"v1"':
+        context.status_code = 206
+        return ARCHIVE[int(byte_range[len('bytes='):-1]):]
+    return ARCHIVE
+
+
+@pytest.fixture
+def archive_mock():
+    with requests_mock.Mocker() as mock:
+        mock.head(
+            ARCHIVE_URL,
+            headers={'Content-Length': str(len(ARCHIVE)), 'ETag': '"v1"'}
+        )
+        mock.get(ARCHIVE_URL, content=archive_response)
+        yield mock
+
+
+def test_download_file(tmp_path, tempfile_session, archive_mock):
+    path = tmp_path / 'python-docs-pdf-a4.zip'
+    assert utils.download_file(tempfile_session, ARCHIVE_URL, path), (
+        'Функция `download_file` должна загружать отсутствующий файл'
+    )
+    assert path.read_bytes() == ARCHIVE
+    assert not (tmp_path / 'python-docs-pdf-a4.zip.part').exists()
+    assert not utils.download_file(tempfile_session, ARCHIVE_URL, path), (
+        'Функция `download_file` не должна повторно загружать файл '
+        'с тем же размером и ETag'
+    )
+    assert not tempfile_session.cache.responses, (
+        'Архивы не должны сохраняться в кеш запросов'
+    )
+
+
+def test_download_file_resumes(tmp_path, tempfile_session, archive_mock):
+    path = tmp_path / 'python-docs-pdf-a4.zip'
+    (tmp_path / 'python-docs-pdf-a4.zip.part').write_bytes(ARCHIVE[:1000])
+    (tmp_path / 'python-docs-pdf-a4.zip.etag').write_text('"v1"')
+    utils.download_file(tempfile_session, ARCHIVE_URL, path)
+    assert archive_mock.last_request.headers['Range'] == 'bytes=1000-', (
+        'Функция `download_file` должна докачивать файл запросом Range'
+    )
+    assert path.read_bytes() == ARCHIVE
+
+
+def test_download_file_restarts_oversized_part(
+    tmp_path, tempfile_session, archive_mock
+):
+    path = tmp_path / 'python-docs-pdf-a4.zip'
+    (tmp_path / 'python-docs-pdf-a4.zip.part').write_bytes(ARCHIVE + b'junk')
+    (tmp_path / 'python-docs-pdf-a4.zip.etag').write_text('"v1"')
+    assert utils.download_file(tempfile_session, ARCHIVE_URL, path)
+    assert 'Range' not in archive_mock.last_request.headers, (
+        'Файл `.part` больше удалённого нужно загружать заново, без Range'
+    )
+    assert path.read_bytes() == ARCHIVE, (
+        'Функция `download_file` не должна переименовывать файл `.part`, '
+        'который больше удалённого'
+    )
+
+
+@pytest.mark.parametrize('status, headers, expected', [
+    (200, {}, None),
+    (429, {'Retry-After': '7'}, 7),
+    (503, {}, 0.5),
+    (503, {'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'}, 0),
+])
+def test_get_retry_after(status, headers, expected):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers)
+    assert utils.get_retry_after(response, attempt=0) == expected, (
+        'Функция `get_retry_after` должна учитывать заголовок Retry-After '
+        'для ответов 429 и 503'
+    )